@@ -1,26 +1,37 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 from contextlib import asynccontextmanager
 import gzip
 import hashlib
-import json
+import os
 import re
+import sqlite3
+import threading
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+import aiofiles
+import aiofiles.os
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from starlette.middleware.base import BaseHTTPMiddleware
 
 from config import (
     CACHE_TTL,
     HISTORICAL_SCAN_LIMIT_DEFAULT,
     MAX_HISTORICAL_SCAN_LIMIT,
+    REDIS_URL,
     SCAN_COOLDOWN_MINUTES,
 )
 from gold_scraper import GoldScraper
@@ -31,17 +42,66 @@ STATIC_DIR = BASE_DIR / "static"
 DATA_DIR = BASE_DIR / "data"
 TEMPLATES_DIR = BASE_DIR / "templates"
 CACHE_DIR = BASE_DIR / "cache"
+SUMMARY_DB_PATH = DATA_DIR / "scan_summaries.sqlite"
+RESPONSE_CACHE_PREFIX = "gold-deal-finder:response:"
 
 for directory in (STATIC_DIR, DATA_DIR, TEMPLATES_DIR, CACHE_DIR):
     directory.mkdir(exist_ok=True)
 
+CACHED_GET_PATHS = frozenset(
+    {
+        "/api/v1/historical/scans",
+        "/api/v1/historical/products",
+        "/api/v1/historical/stats",
+        "/api/v1/historical/timeline",
+        "/api/v1/spot-price",
+        "/api/v1/products/latest",
+        "/api/v1/stats/summary",
+    }
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global redis_client
+
     ensure_sample_data_if_empty()
+    redis_client = connect_redis()
     yield
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
+
+async def cache_get_responses(request: Request, call_next: Callable) -> Response:
+    if request.method != "GET" or request.url.path not in CACHED_GET_PATHS:
+        return await call_next(request)
+
+    cache_key = get_cache_key("http", path=request.url.path, query=sorted(request.query_params.multi_items()))
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    response = await call_next(request)
+    if response.status_code != 200 or response.headers.get("content-type") != "application/json":
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    await set_cached_response(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
 
 
-app = FastAPI(title="Gold Deal Finder", version="3.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="Gold Deal Finder",
+    version="3.0.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse,
+)
+app.add_middleware(BaseHTTPMiddleware, dispatch=cache_get_responses)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -53,11 +113,23 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 scraper = GoldScraper()
 price_calculator = GoldPriceCalculator()
-response_cache: dict[str, tuple[Any, float]] = {}
+response_cache: TTLCache = TTLCache(maxsize=512, ttl=CACHE_TTL)
+response_cache_lock = threading.RLock()
+redis_client: Any = None
+scan_file_cache: LRUCache = LRUCache(maxsize=128)
+scan_columns_cache: LRUCache = LRUCache(maxsize=128)
+scan_file_cache_lock = threading.RLock()
+scan_index: Dict[str, Any] = {"dir_mtime_ns": None, "files": [], "neg_mtimes_ns": [], "by_id": {}}
+scan_index_lock = threading.Lock()
+summary_db: Optional[sqlite3.Connection] = None
+summary_db_lock = threading.Lock()
 scan_lock = asyncio.Lock()
 last_scan_time: datetime | None = None
 SCAN_COOLDOWN = timedelta(minutes=SCAN_COOLDOWN_MINUTES) if SCAN_COOLDOWN_MINUTES > 0 else None
 TIMESTAMP_PATTERN = re.compile(r"(\d{8}_\d{6}|\d{8}_\d{4})")
+HISTORICAL_STATS_SCAN_COUNT = max(30, HISTORICAL_SCAN_LIMIT_DEFAULT)
+
+T = TypeVar("T")
 
 
 class ProductResponse(BaseModel):
@@ -104,39 +176,65 @@ class HistoricalStatsResponse(BaseModel):
     purity_distribution: Dict[str, int]
 
 
-def now_ts() -> float:
-    return datetime.now().timestamp()
+def connect_redis() -> Any:
+    if not REDIS_URL:
+        return None
+    try:
+        import redis.asyncio as redis_asyncio
+    except ImportError:
+        print("⚠️ REDIS_URL is set but the redis package is not installed; using the in-process cache")
+        return None
+    return redis_asyncio.Redis.from_url(REDIS_URL)
 
 
-def clear_response_cache() -> None:
-    response_cache.clear()
+async def clear_response_cache() -> None:
+    with response_cache_lock:
+        response_cache.clear()
+    if redis_client is None:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=f"{RESPONSE_CACHE_PREFIX}*")]
+        if keys:
+            await redis_client.delete(*keys)
+    except Exception as exc:
+        print(f"Error clearing Redis cache: {exc}")
 
 
-def get_cache_key(prefix: str, **kwargs: Any) -> str:
-    payload = prefix + json.dumps(kwargs, sort_keys=True, default=str)
-    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+async def response_cache_size() -> int:
+    if redis_client is None:
+        return len(response_cache)
+    try:
+        return sum([1 async for _ in redis_client.scan_iter(match=f"{RESPONSE_CACHE_PREFIX}*")])
+    except Exception as exc:
+        print(f"Error reading Redis cache: {exc}")
+        return 0
 
 
-def get_cached_response(cache_key: str) -> Optional[Any]:
-    cached = response_cache.get(cache_key)
-    if not cached:
-        return None
-
-    data, created_at = cached
-    if now_ts() - created_at >= CACHE_TTL:
-        response_cache.pop(cache_key, None)
-        return None
-    return data
+def get_cache_key(prefix: str, **kwargs: Any) -> str:
+    payload = prefix.encode("utf-8") + orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
-MAX_CACHE_SIZE = 100
+async def get_cached_response(cache_key: str) -> Optional[bytes]:
+    if redis_client is not None:
+        try:
+            return await redis_client.get(RESPONSE_CACHE_PREFIX + cache_key)
+        except Exception as exc:
+            print(f"Error reading Redis cache: {exc}")
+            return None
+    with response_cache_lock:
+        return response_cache.get(cache_key)
 
 
-def set_cached_response(cache_key: str, data: Any) -> None:
-    if len(response_cache) >= MAX_CACHE_SIZE:
-        oldest_key = min(response_cache, key=lambda k: response_cache[k][1])
-        del response_cache[oldest_key]
-    response_cache[cache_key] = (data, now_ts())
+async def set_cached_response(cache_key: str, data: bytes) -> None:
+    if redis_client is not None:
+        try:
+            await redis_client.set(RESPONSE_CACHE_PREFIX + cache_key, data, ex=CACHE_TTL)
+        except Exception as exc:
+            print(f"Error writing Redis cache: {exc}")
+        return
+    with response_cache_lock:
+        response_cache[cache_key] = data
 
 
 def error_detail(code: str, message: str, **extra: Any) -> Dict[str, Any]:
@@ -145,10 +243,71 @@ def error_detail(code: str, message: str, **extra: Any) -> Dict[str, Any]:
     return detail
 
 
-def get_all_scan_files() -> List[Path]:
-    scan_files = list(DATA_DIR.glob("scan_results_*.json"))
-    scan_files.extend(DATA_DIR.glob("scan_results_*.json.gz"))
-    return sorted(scan_files, key=lambda path: path.stat().st_mtime, reverse=True)
+def is_scan_file_name(name: str) -> bool:
+    return name.startswith("scan_results_") and (name.endswith(".json") or name.endswith(".json.gz"))
+
+
+def scan_data_dir() -> List[tuple[int, Path]]:
+    entries: List[tuple[int, Path]] = []
+    with os.scandir(DATA_DIR) as iterator:
+        for entry in iterator:
+            if not is_scan_file_name(entry.name):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime_ns, Path(entry.path)))
+            except OSError:
+                continue
+    entries.sort(key=lambda item: item[0], reverse=True)
+    return entries
+
+
+def index_scan_ids(scan_files: List[Path]) -> Dict[str, Path]:
+    by_id: Dict[str, Path] = {}
+    for file_path in scan_files:
+        scan_id = extract_scan_id(file_path)
+        if scan_id not in by_id or file_path.suffix == ".json":
+            by_id[scan_id] = file_path
+    return by_id
+
+
+def refresh_scan_index() -> Dict[str, Any]:
+    global scan_index
+
+    try:
+        dir_mtime_ns = DATA_DIR.stat().st_mtime_ns
+    except OSError:
+        return {"dir_mtime_ns": None, "files": [], "neg_mtimes_ns": [], "by_id": {}}
+
+    with scan_index_lock:
+        if scan_index["dir_mtime_ns"] == dir_mtime_ns:
+            return scan_index
+
+    entries = scan_data_dir()
+    scan_files = [path for _, path in entries]
+    index = {
+        "dir_mtime_ns": dir_mtime_ns,
+        "files": scan_files,
+        "neg_mtimes_ns": [-mtime_ns for mtime_ns, _ in entries],
+        "by_id": index_scan_ids(scan_files),
+    }
+    with scan_index_lock:
+        scan_index = index
+    return index
+
+
+def scan_file_count() -> int:
+    return len(refresh_scan_index()["files"])
+
+
+def recent_scan_files(count: int, offset: int = 0) -> List[Path]:
+    return refresh_scan_index()["files"][offset : offset + count]
+
+
+def scan_files_since(cutoff: datetime) -> List[tuple[Path, int]]:
+    index = refresh_scan_index()
+    neg_mtimes_ns = index["neg_mtimes_ns"]
+    stop = bisect.bisect_right(neg_mtimes_ns, -int(cutoff.timestamp() * 1_000_000_000))
+    return [(file_path, -neg_mtime_ns) for file_path, neg_mtime_ns in zip(index["files"][:stop], neg_mtimes_ns[:stop])]
 
 
 def extract_scan_id(file_path: Path) -> str:
@@ -160,8 +319,9 @@ def extract_scan_id(file_path: Path) -> str:
     return name.replace("scan_results_", "")
 
 
-def parse_file_timestamp(file_path: Path) -> str:
-    match = TIMESTAMP_PATTERN.search(file_path.name)
+@lru_cache(maxsize=1024)
+def timestamp_from_name(name: str) -> Optional[str]:
+    match = TIMESTAMP_PATTERN.search(name)
     if match:
         raw_value = match.group(1)
         fmt = "%Y%m%d_%H%M%S" if len(raw_value) == 15 else "%Y%m%d_%H%M"
@@ -169,16 +329,23 @@ def parse_file_timestamp(file_path: Path) -> str:
             return datetime.strptime(raw_value, fmt).isoformat()
         except ValueError:
             pass
+    return None
+
+
+def parse_file_timestamp(file_path: Path) -> str:
+    timestamp = timestamp_from_name(file_path.name)
+    if timestamp is not None:
+        return timestamp
     return datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
 
 
 def load_json_payload(file_path: Path) -> Any:
     if file_path.suffix == ".gz":
-        with gzip.open(file_path, "rt", encoding="utf-8") as handle:
-            return json.load(handle)
+        with gzip.open(file_path, "rb") as handle:
+            return orjson.loads(handle.read())
 
-    with open(file_path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
+    with open(file_path, "rb") as handle:
+        return orjson.loads(handle.read())
 
 
 def coerce_products(payload: Any) -> List[Dict[str, Any]]:
@@ -205,16 +372,7 @@ def enrich_product(product: Dict[str, Any], scan_id: str) -> Dict[str, Any]:
     return enriched
 
 
-def load_scan_file(file_path: Path) -> Optional[Dict[str, Any]]:
-    try:
-        payload = load_json_payload(file_path)
-    except Exception as exc:
-        print(f"Error loading scan file {file_path}: {exc}")
-        return None
-
-    scan_id = extract_scan_id(file_path)
-    products = [enrich_product(item, scan_id) for item in coerce_products(payload)]
-
+def build_scan_summary(file_path: Path, payload: Any, products: List[Dict[str, Any]]) -> Dict[str, Any]:
     if isinstance(payload, dict) and payload.get("timestamp"):
         timestamp = str(payload["timestamp"])
     else:
@@ -227,21 +385,210 @@ def load_scan_file(file_path: Path) -> Optional[Dict[str, Any]]:
         source_breakdown[source] = source_breakdown.get(source, 0) + 1
 
     return {
-        "scan_id": scan_id,
+        "scan_id": extract_scan_id(file_path),
         "timestamp": timestamp,
         "total_products": len(products),
         "good_deals": sum(1 for discount in discounts if discount >= 10),
         "avg_discount": round(sum(discounts) / len(discounts), 2) if discounts else 0,
         "source_breakdown": source_breakdown,
         "file_name": file_path.name,
-        "products": products,
     }
 
 
+def read_scan_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        payload = load_json_payload(file_path)
+    except Exception as exc:
+        print(f"Error loading scan file {file_path}: {exc}")
+        return None
+
+    scan_id = extract_scan_id(file_path)
+    products = [enrich_product(item, scan_id) for item in coerce_products(payload)]
+    scan_data = build_scan_summary(file_path, payload, products)
+    scan_data["products"] = products
+    return scan_data
+
+
+def read_scan_summary(file_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        payload = load_json_payload(file_path)
+    except Exception as exc:
+        print(f"Error loading scan file {file_path}: {exc}")
+        return None
+    return build_scan_summary(file_path, payload, coerce_products(payload))
+
+
+def build_scan_columns(products: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    return {
+        "discount_percent": np.fromiter(
+            (float(product.get("discount_percent", 0) or 0) for product in products),
+            dtype=np.float64,
+            count=len(products),
+        ),
+        # Display values for the distributions; missing fields count as "Unknown"
+        "source": np.array([str(product.get("source", "Unknown") or "Unknown") for product in products], dtype=object),
+        "purity": np.array([str(product.get("purity", "Unknown") or "Unknown") for product in products], dtype=object),
+        # Raw values for the query filters, so ?source=Unknown only matches a literal "Unknown"
+        "source_raw": np.array([product.get("source") for product in products], dtype=object),
+        "purity_raw": np.array([product.get("purity") for product in products], dtype=object),
+        "title_lower": np.array([str(product.get("title", "")).lower() for product in products], dtype=object),
+        "brand_lower": np.array([str(product.get("brand", "")).lower() for product in products], dtype=object),
+    }
+
+
+def value_counts(values: np.ndarray) -> Dict[str, int]:
+    if not len(values):
+        return {}
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def cached_by_mtime(cache: LRUCache, file_path: Path, loader: Callable[[Path], Optional[T]]) -> Optional[T]:
+    try:
+        cache_key = (str(file_path), file_path.stat().st_mtime_ns)
+    except OSError as exc:
+        print(f"Error loading scan file {file_path}: {exc}")
+        return None
+
+    with scan_file_cache_lock:
+        cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    value = loader(file_path)
+    if value is not None:
+        with scan_file_cache_lock:
+            cache[cache_key] = value
+    return value
+
+
+def load_scan_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    return cached_by_mtime(scan_file_cache, file_path, read_scan_file)
+
+
+def _read_scan_columns(file_path: Path) -> Optional[Dict[str, np.ndarray]]:
+    scan_data = load_scan_file(file_path)
+    if not scan_data:
+        return None
+    return build_scan_columns(scan_data["products"])
+
+
+def load_scan_columns(file_path: Path) -> Optional[Dict[str, np.ndarray]]:
+    return cached_by_mtime(scan_columns_cache, file_path, _read_scan_columns)
+
+
+def get_summary_db() -> sqlite3.Connection:
+    global summary_db
+    if summary_db is None:
+        summary_db = sqlite3.connect(SUMMARY_DB_PATH, check_same_thread=False)
+        summary_db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scans (
+                file_name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                scan_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                total_products INTEGER NOT NULL,
+                good_deals INTEGER NOT NULL,
+                avg_discount REAL NOT NULL,
+                source_breakdown TEXT NOT NULL
+            )
+            """
+        )
+        summary_db.commit()
+    return summary_db
+
+
+def store_scan_summaries(entries: List[tuple[Path, Dict[str, Any]]]) -> None:
+    rows = []
+    for file_path, summary in entries:
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            continue
+        rows.append(
+            (
+                summary["file_name"],
+                mtime_ns,
+                summary["scan_id"],
+                summary["timestamp"],
+                summary["total_products"],
+                summary["good_deals"],
+                summary["avg_discount"],
+                orjson.dumps(summary["source_breakdown"]).decode("utf-8"),
+            )
+        )
+    if not rows:
+        return
+
+    try:
+        with summary_db_lock:
+            db = get_summary_db()
+            db.executemany("INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+    except sqlite3.Error as exc:
+        print(f"Error saving scan summaries: {exc}")
+
+
+def read_stored_summaries(file_paths: List[Path]) -> Dict[str, Dict[str, Any]]:
+    rows: Dict[str, tuple] = {}
+    names = [file_path.name for file_path in file_paths]
+    try:
+        with summary_db_lock:
+            db = get_summary_db()
+            for start in range(0, len(names), 500):
+                chunk = names[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in db.execute(f"SELECT * FROM scans WHERE file_name IN ({placeholders})", chunk):
+                    rows[row[0]] = row
+    except sqlite3.Error as exc:
+        print(f"Error reading scan summaries: {exc}")
+        return {}
+
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for file_path in file_paths:
+        row = rows.get(file_path.name)
+        if not row:
+            continue
+        try:
+            if file_path.stat().st_mtime_ns != row[1]:
+                continue
+        except OSError:
+            continue
+        summaries[file_path.name] = {
+            "scan_id": row[2],
+            "timestamp": row[3],
+            "total_products": row[4],
+            "good_deals": row[5],
+            "avg_discount": row[6],
+            "source_breakdown": orjson.loads(row[7]),
+            "file_name": row[0],
+        }
+    return summaries
+
+
+async def load_scan_summaries(file_paths: List[Path]) -> Dict[str, Dict[str, Any]]:
+    summaries = await asyncio.to_thread(read_stored_summaries, file_paths)
+    missing = [file_path for file_path in file_paths if file_path.name not in summaries]
+    if not missing:
+        return summaries
+
+    backfill: List[tuple[Path, Dict[str, Any]]] = []
+    for file_path, summary in zip(missing, await asyncio.gather(*(asyncio.to_thread(read_scan_summary, file_path) for file_path in missing))):
+        if not summary:
+            continue
+        summaries[file_path.name] = summary
+        backfill.append((file_path, summary))
+    await asyncio.to_thread(store_scan_summaries, backfill)
+    return summaries
+
+
 def resolve_scan_file(scan_id: str) -> Optional[Path]:
+    file_path = refresh_scan_index()["by_id"].get(scan_id)
+    if file_path is not None:
+        return file_path
+
     candidates = [
-        DATA_DIR / f"scan_results_{scan_id}.json",
-        DATA_DIR / f"scan_results_{scan_id}.json.gz",
         DATA_DIR / f"{scan_id}.json",
         DATA_DIR / f"{scan_id}.json.gz",
     ]
@@ -251,25 +598,65 @@ def resolve_scan_file(scan_id: str) -> Optional[Path]:
     return None
 
 
-def get_all_historical_products(
+def load_scan_entry(file_path: Path) -> Optional[tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+    scan_data = load_scan_file(file_path)
+    columns = load_scan_columns(file_path)
+    if not scan_data or columns is None:
+        return None
+    return scan_data, columns
+
+
+def concat_scan_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    if not parts:
+        return build_scan_columns([])
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+async def get_all_historical_products(
     scan_limit: int = HISTORICAL_SCAN_LIMIT_DEFAULT,
     limit_per_file: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+) -> tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    entries = await asyncio.gather(
+        *(asyncio.to_thread(load_scan_entry, file_path) for file_path in recent_scan_files(scan_limit))
+    )
     products: List[Dict[str, Any]] = []
-    for file_path in get_all_scan_files()[:scan_limit]:
-        scan_data = load_scan_file(file_path)
-        if not scan_data:
+    column_parts: List[Dict[str, np.ndarray]] = []
+    for entry in entries:
+        if entry is None:
             continue
-        scan_products = scan_data["products"]
-        if limit_per_file is not None:
-            scan_products = scan_products[:limit_per_file]
-        products.extend(scan_products)
-    return products
+        scan_data, columns = entry
+        stop = len(scan_data["products"]) if limit_per_file is None else limit_per_file
+        products.extend(scan_data["products"][:stop])
+        column_parts.append({key: values[:stop] for key, values in columns.items()})
+    return products, concat_scan_columns(column_parts)
+
+
+def product_filter_mask(
+    columns: Dict[str, np.ndarray],
+    source: Optional[str],
+    purity: Optional[str],
+    min_discount: float,
+    max_discount: float,
+) -> np.ndarray:
+    discounts = columns["discount_percent"]
+    mask = (discounts >= min_discount) & (discounts <= max_discount)
+    if source:
+        mask &= columns["source_raw"] == source
+    if purity:
+        mask &= columns["purity_raw"] == purity
+    return mask
 
 
-def get_historical_stats() -> Dict[str, Any]:
-    scan_files = get_all_scan_files()
-    if not scan_files:
+async def load_recent_scan_entries() -> List[Optional[tuple[Dict[str, Any], Dict[str, np.ndarray]]]]:
+    recent_files = recent_scan_files(HISTORICAL_STATS_SCAN_COUNT)
+    return await asyncio.gather(*(asyncio.to_thread(load_scan_entry, file_path) for file_path in recent_files))
+
+
+def compute_historical_stats(
+    total_scans: int,
+    entries: List[Optional[tuple[Dict[str, Any], Dict[str, np.ndarray]]]],
+) -> Dict[str, Any]:
+    if not total_scans:
         return {
             "total_scans": 0,
             "total_products_ever": 0,
@@ -283,78 +670,119 @@ def get_historical_stats() -> Dict[str, Any]:
 
     total_products = 0
     total_good_deals = 0
-    all_discounts: List[float] = []
-    best_deal: Optional[Dict[str, Any]] = None
     scans_by_day: Dict[str, int] = defaultdict(int)
-    source_distribution: Dict[str, int] = defaultdict(int)
-    purity_distribution: Dict[str, int] = defaultdict(int)
+    loaded_scans: List[Dict[str, Any]] = []
+    loaded_columns: List[Dict[str, np.ndarray]] = []
 
-    for file_path in scan_files[: max(30, HISTORICAL_SCAN_LIMIT_DEFAULT)]:
-        scan_data = load_scan_file(file_path)
-        if not scan_data:
+    for entry in entries:
+        if entry is None:
             continue
 
+        scan_data, columns = entry
         total_products += scan_data["total_products"]
         total_good_deals += scan_data["good_deals"]
         scans_by_day[str(scan_data["timestamp"])[:10]] += 1
+        loaded_scans.append(scan_data)
+        loaded_columns.append(columns)
 
-        for product in scan_data["products"]:
-            discount = float(product.get("discount_percent", 0) or 0)
-            all_discounts.append(discount)
-
-            if not best_deal or discount > float(best_deal.get("discount", 0) or 0):
-                best_deal = {
-                    "title": product.get("title", "Unknown"),
-                    "discount": discount,
-                    "price": product.get("selling_price", 0),
-                    "source": product.get("source", "Unknown"),
-                    "timestamp": product.get("timestamp", scan_data["timestamp"]),
-                    "weight": product.get("weight_grams", 0),
-                    "purity": product.get("purity", "Unknown"),
-                    "scan_id": scan_data["scan_id"],
-                }
-
-            source_distribution[product.get("source", "Unknown") or "Unknown"] += 1
-            purity_distribution[product.get("purity", "Unknown") or "Unknown"] += 1
-
-    avg_discount_all = sum(all_discounts) / len(all_discounts) if all_discounts else 0
+    best_deal: Optional[Dict[str, Any]] = None
+    avg_discount_all = 0.0
+    source_distribution: Dict[str, int] = {}
+    purity_distribution: Dict[str, int] = {}
+
+    if loaded_columns:
+        discounts = np.concatenate([columns["discount_percent"] for columns in loaded_columns])
+        if discounts.size:
+            avg_discount_all = float(discounts.mean())
+
+            best_index = int(discounts.argmax())
+            offsets = np.cumsum([len(columns["discount_percent"]) for columns in loaded_columns])
+            scan_position = int(np.searchsorted(offsets, best_index, side="right"))
+            scan_data = loaded_scans[scan_position]
+            local_index = best_index - (int(offsets[scan_position - 1]) if scan_position else 0)
+            product = scan_data["products"][local_index]
+            best_deal = {
+                "title": product.get("title", "Unknown"),
+                "discount": float(discounts[best_index]),
+                "price": product.get("selling_price", 0),
+                "source": product.get("source", "Unknown"),
+                "timestamp": product.get("timestamp", scan_data["timestamp"]),
+                "weight": product.get("weight_grams", 0),
+                "purity": product.get("purity", "Unknown"),
+                "scan_id": scan_data["scan_id"],
+            }
+
+        source_distribution = value_counts(np.concatenate([columns["source"] for columns in loaded_columns]))
+        purity_distribution = value_counts(np.concatenate([columns["purity"] for columns in loaded_columns]))
 
     return {
-        "total_scans": len(scan_files),
+        "total_scans": total_scans,
         "total_products_ever": total_products,
         "total_good_deals": total_good_deals,
         "avg_discount_all": round(avg_discount_all, 2),
         "best_deal_ever": best_deal,
         "scans_by_day": dict(sorted(scans_by_day.items(), reverse=True)[:14]),
-        "source_distribution": dict(source_distribution),
-        "purity_distribution": dict(purity_distribution),
+        "source_distribution": source_distribution,
+        "purity_distribution": purity_distribution,
     }
 
 
+async def get_historical_stats() -> Dict[str, Any]:
+    entries = await load_recent_scan_entries()
+    return compute_historical_stats(scan_file_count(), entries)
+
+
+@lru_cache(maxsize=4096)
+def timestamp_sort_value(value: str) -> float:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except Exception:
+        return 0.0
+
+
 def sort_products(products: List[Dict[str, Any]], sort_by: str, sort_order: str) -> None:
     reverse = sort_order.lower() == "desc"
 
-    def sort_key(item: Dict[str, Any]) -> Any:
-        value = item.get(sort_by)
-        if sort_by == "timestamp":
-            try:
-                return datetime.fromisoformat(str(value)).timestamp()
-            except Exception:
-                return 0
-        return value if value is not None else 0
+    if sort_by == "timestamp":
+        values: List[Any] = [timestamp_sort_value(str(item.get(sort_by))) for item in products]
+    else:
+        values = [item.get(sort_by) for item in products]
+        values = [0 if value is None else value for value in values]
+        if not all(isinstance(value, (int, float)) for value in values):
+            products.sort(key=lambda item: item.get(sort_by) if item.get(sort_by) is not None else 0, reverse=reverse)
+            return
 
-    products.sort(key=sort_key, reverse=reverse)
+    keys = np.asarray(values, dtype=np.float64)
+    order = np.argsort(-keys if reverse else keys, kind="stable")
+    products[:] = [products[index] for index in order]
 
 
-def save_results(filename: str | Path, data: Dict[str, Any]) -> None:
+def encode_scan_payload(output_path: Path, data: Dict[str, Any]) -> bytes:
+    payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    if output_path.suffix == ".gz":
+        return gzip.compress(payload, compresslevel=3)
+    return payload
+
+
+def store_saved_summary(output_path: Path, data: Dict[str, Any]) -> None:
+    store_scan_summaries([(output_path, build_scan_summary(output_path, data, coerce_products(data)))])
+
+
+async def save_results(filename: str | Path, data: Dict[str, Any]) -> None:
     output_path = Path(filename)
     output_path.parent.mkdir(exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2, default=str)
+    payload = await asyncio.to_thread(encode_scan_payload, output_path, data)
+
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    async with aiofiles.open(temp_path, "wb") as handle:
+        await handle.write(payload)
+    await aiofiles.os.replace(temp_path, output_path)
+
+    await asyncio.to_thread(store_saved_summary, output_path, data)
 
 
 def ensure_sample_data_if_empty() -> None:
-    if get_all_scan_files():
+    if recent_scan_files(1):
         return
 
     from sample_data import create_sample_scans
@@ -370,25 +798,21 @@ async def root() -> FileResponse:
     return FileResponse(STATIC_DIR / "index.html")
 
 
-@app.get("/api/v1/historical/scans", response_model=List[ScanHistoryResponse])
+@app.get("/api/v1/historical/scans", responses={200: {"model": List[ScanHistoryResponse]}})
 async def get_scan_history(
     limit: int = Query(30, ge=1, le=100, description="Number of scans to return"),
     offset: int = Query(0, ge=0, description="Skip offset"),
 ):
-    cache_key = get_cache_key("historical_scans", limit=limit, offset=offset)
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
-    scans: List[ScanHistoryResponse] = []
-    for file_path in get_all_scan_files()[offset : offset + limit]:
-        scan_data = load_scan_file(file_path)
+    scan_files = recent_scan_files(limit, offset)
+    summaries = await load_scan_summaries(scan_files)
+    scans: List[Dict[str, Any]] = []
+    for file_path in scan_files:
+        scan_data = summaries.get(file_path.name)
         if not scan_data:
             continue
-        scans.append(ScanHistoryResponse(**{key: scan_data[key] for key in ScanHistoryResponse.model_fields}))
+        scans.append({key: scan_data[key] for key in ScanHistoryResponse.model_fields})
 
-    set_cached_response(cache_key, scans)
-    return scans
+    return OrjsonResponse(scans)
 
 
 @app.get("/api/v1/historical/products")
@@ -410,24 +834,6 @@ async def get_historical_products(
         description="How many recent scans to search when scan_id is not provided",
     ),
 ):
-    cache_key = get_cache_key(
-        "historical_products",
-        scan_id=scan_id,
-        source=source,
-        purity=purity,
-        min_discount=min_discount,
-        max_discount=max_discount,
-        search=search,
-        limit=limit,
-        offset=offset,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        scan_limit=scan_limit,
-    )
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
     if scan_id:
         file_path = resolve_scan_file(scan_id)
         if not file_path:
@@ -435,59 +841,45 @@ async def get_historical_products(
                 status_code=404,
                 detail=error_detail("scan_not_found", f"Scan '{scan_id}' was not found.", scan_id=scan_id),
             )
-        scan_data = load_scan_file(file_path)
-        if not scan_data:
+        entry = await asyncio.to_thread(load_scan_entry, file_path)
+        if not entry:
             raise HTTPException(
                 status_code=500,
                 detail=error_detail("scan_load_failed", f"Scan '{scan_id}' could not be loaded.", scan_id=scan_id),
             )
-        products = list(scan_data["products"])
+        products, columns = entry[0]["products"], entry[1]
         effective_scan_limit = 1
     else:
-        products = get_all_historical_products(scan_limit=scan_limit)
+        products, columns = await get_all_historical_products(scan_limit=scan_limit)
         effective_scan_limit = scan_limit
 
-    filtered_products = list(products)
-    if source:
-        filtered_products = [product for product in filtered_products if product.get("source") == source]
-    if purity:
-        filtered_products = [product for product in filtered_products if product.get("purity") == purity]
-    filtered_products = [
-        product
-        for product in filtered_products
-        if min_discount <= float(product.get("discount_percent", 0) or 0) <= max_discount
-    ]
+    indices = np.flatnonzero(product_filter_mask(columns, source, purity, min_discount, max_discount)).tolist()
     if search:
         term = search.lower()
+        titles = columns["title_lower"]
+        brands = columns["brand_lower"]
         filtered_products = [
-            product
-            for product in filtered_products
-            if term in str(product.get("title", "")).lower() or term in str(product.get("brand", "")).lower()
+            products[index] for index in indices if term in titles[index] or term in brands[index]
         ]
+    else:
+        filtered_products = [products[index] for index in indices]
 
     sort_products(filtered_products, sort_by, sort_order)
 
-    response = {
-        "total": len(filtered_products),
-        "offset": offset,
-        "limit": limit,
-        "scan_limit": effective_scan_limit,
-        "products": filtered_products[offset : offset + limit],
-    }
-    set_cached_response(cache_key, response)
-    return response
+    return OrjsonResponse(
+        {
+            "total": len(filtered_products),
+            "offset": offset,
+            "limit": limit,
+            "scan_limit": effective_scan_limit,
+            "products": filtered_products[offset : offset + limit],
+        }
+    )
 
 
-@app.get("/api/v1/historical/stats", response_model=HistoricalStatsResponse)
+@app.get("/api/v1/historical/stats", responses={200: {"model": HistoricalStatsResponse}})
 async def get_historical_stats_endpoint():
-    cache_key = get_cache_key("historical_stats")
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
-    stats = get_historical_stats()
-    set_cached_response(cache_key, stats)
-    return stats
+    return OrjsonResponse(await get_historical_stats())
 
 
 @app.get("/api/v1/historical/scan/{scan_id}")
@@ -499,50 +891,48 @@ async def get_specific_scan(scan_id: str):
             detail=error_detail("scan_not_found", f"Scan '{scan_id}' was not found.", scan_id=scan_id),
         )
 
-    scan_data = load_scan_file(file_path)
+    scan_data = await asyncio.to_thread(load_scan_file, file_path)
     if not scan_data:
         raise HTTPException(
             status_code=500,
             detail=error_detail("scan_load_failed", f"Scan '{scan_id}' could not be loaded.", scan_id=scan_id),
         )
-    return scan_data
+    return OrjsonResponse(scan_data)
 
 
 @app.get("/api/v1/historical/timeline")
 async def get_scan_timeline(days: int = Query(30, ge=1, le=365)):
-    cache_key = get_cache_key("timeline", days=days)
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
     cutoff = datetime.now() - timedelta(days=days)
     timeline: Dict[str, Dict[str, Any]] = {}
 
-    for file_path in get_all_scan_files():
-        file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-        if file_time < cutoff:
-            continue
-
+    recent_files: List[Path] = []
+    recent_dates: List[str] = []
+    for file_path, mtime_ns in scan_files_since(cutoff):
+        file_time = datetime.fromtimestamp(mtime_ns / 1_000_000_000)
         date_key = file_time.strftime("%Y-%m-%d")
         hour_key = file_time.strftime("%H:00")
         bucket = timeline.setdefault(date_key, {"total": 0, "scans": 0, "products": 0, "by_hour": {}})
         bucket["total"] += 1
         bucket["scans"] += 1
         bucket["by_hour"][hour_key] = bucket["by_hour"].get(hour_key, 0) + 1
+        recent_files.append(file_path)
+        recent_dates.append(date_key)
 
-        scan_data = load_scan_file(file_path)
-        if scan_data:
-            bucket["products"] += scan_data["total_products"]
+    summaries = await load_scan_summaries(recent_files)
+    for file_path, date_key in zip(recent_files, recent_dates):
+        summary = summaries.get(file_path.name)
+        if summary:
+            timeline[date_key]["products"] += summary["total_products"]
 
     ordered_timeline = dict(sorted(timeline.items()))
-    response = {
-        "days": days,
-        "timeline": ordered_timeline,
-        "total_scans": sum(day["scans"] for day in ordered_timeline.values()),
-        "total_products": sum(day["products"] for day in ordered_timeline.values()),
-    }
-    set_cached_response(cache_key, response)
-    return response
+    return OrjsonResponse(
+        {
+            "days": days,
+            "timeline": ordered_timeline,
+            "total_scans": sum(day["scans"] for day in ordered_timeline.values()),
+            "total_products": sum(day["products"] for day in ordered_timeline.values()),
+        }
+    )
 
 
 async def _trigger_scan(background_tasks: BackgroundTasks) -> Dict[str, Any]:
@@ -564,7 +954,7 @@ async def _trigger_scan(background_tasks: BackgroundTasks) -> Dict[str, Any]:
         last_scan_time = now
 
     try:
-        products = await asyncio.to_thread(scraper.scrape_all)
+        products = await scraper.scrape_all_async()
     except Exception as exc:
         async with scan_lock:
             last_scan_time = None
@@ -574,14 +964,14 @@ async def _trigger_scan(background_tasks: BackgroundTasks) -> Dict[str, Any]:
         ) from exc
 
     timestamp = now.strftime("%Y%m%d_%H%M%S")
-    filename = DATA_DIR / f"scan_results_{timestamp}.json"
+    filename = DATA_DIR / f"scan_results_{timestamp}.json.gz"
     scan_data = {
         "timestamp": now.isoformat(),
         "total_products": len(products),
         "products": products,
     }
     background_tasks.add_task(save_results, filename, scan_data)
-    clear_response_cache()
+    background_tasks.add_task(clear_response_cache)
 
     return {
         "success": True,
@@ -601,59 +991,44 @@ async def scan_products(background_tasks: BackgroundTasks):
 
 @app.get("/api/v1/spot-price")
 async def get_spot_price():
-    cache_key = get_cache_key("spot_price")
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
     try:
-        spot_price = await price_calculator.get_live_gold_price()
+        spot_price = await asyncio.to_thread(price_calculator.get_live_gold_price)
     except Exception as exc:
         raise HTTPException(
             status_code=500,
             detail=error_detail("spot_price_failed", f"Unable to fetch spot price: {exc}"),
         ) from exc
 
-    set_cached_response(cache_key, spot_price)
     return spot_price
 
 
 @app.get("/api/v1/products/latest")
 async def get_latest_products(limit: int = Query(100, ge=1, le=1000, description="Number of products")):
-    cache_key = get_cache_key("latest_products", limit=limit)
-    cached = get_cached_response(cache_key)
-    if cached is not None:
-        return cached
-
-    scan_files = get_all_scan_files()
+    scan_files = recent_scan_files(1)
     if not scan_files:
         return []
 
-    scan_data = load_scan_file(scan_files[0])
-    products = scan_data["products"][:limit] if scan_data else []
-    set_cached_response(cache_key, products)
-    return products
+    scan_data = await asyncio.to_thread(load_scan_file, scan_files[0])
+    return OrjsonResponse(scan_data["products"][:limit] if scan_data else [])
 
 
 @app.post("/api/v1/cache/clear")
 async def clear_cache():
-    clear_response_cache()
+    await clear_response_cache()
     return {"message": "Cache cleared", "status": "success"}
 
 
 @app.get("/api/v1/stats/summary")
 async def get_summary_stats():
-    live_products = await get_latest_products(limit=500)
-    historical_stats = get_historical_stats()
-
-    live_total = len(live_products)
-    live_avg_discount = sum(product.get("discount_percent", 0) for product in live_products) / live_total if live_total else 0
-    live_good_deals = sum(1 for product in live_products if product.get("discount_percent", 0) >= 10)
+    entries = await load_recent_scan_entries()
+    live_columns = entries[0][1] if entries and entries[0] else None
+    historical_stats = compute_historical_stats(scan_file_count(), entries)
 
-    live_sources: Dict[str, int] = {}
-    for product in live_products:
-        source = product.get("source", "Unknown") or "Unknown"
-        live_sources[source] = live_sources.get(source, 0) + 1
+    live_discounts = live_columns["discount_percent"][:500] if live_columns else np.empty(0)
+    live_total = int(live_discounts.size)
+    live_avg_discount = float(live_discounts.mean()) if live_total else 0
+    live_good_deals = int((live_discounts >= 10).sum())
+    live_sources = value_counts(live_columns["source"][:500]) if live_columns else {}
 
     return {
         "live": {
@@ -671,8 +1046,8 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "cache_size": len(response_cache),
-        "scan_files": len(get_all_scan_files()),
+        "cache_size": await response_cache_size(),
+        "scan_files": scan_file_count(),
         "version": app.version,
         "scan_cooldown_minutes": SCAN_COOLDOWN_MINUTES,
     }
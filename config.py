@@ -88,6 +88,8 @@ JEWELLERY_PREMIUM_22K = 1200
 # Cache settings
 CACHE_TTL = 300  # 5 minutes
 CACHE_FILE = "bullion_cache.json"
+# Optional Redis URL so multiple API workers share one response cache
+REDIS_URL = os.getenv('REDIS_URL', '')
 
 # Local app runtime
 APP_HOST = os.getenv('APP_HOST', '0.0.0.0')
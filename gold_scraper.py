@@ -1,19 +1,30 @@
-import json
+import asyncio
+import importlib.util
 import os
-import requests
+import tempfile
+import httpx
+import orjson
 import time
 import re
 import random
 import logging
 from functools import wraps
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any
 from config import AJIO_API_URL, SEARCH_PARAMS, REQUEST_DELAY
 from price_calculator import GoldPriceCalculator
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
+MYNTRA_SESSION_TTL = 30 * 60  # seconds warmed Myntra cookies are reused across scans
+MYNTRA_BLOCKED_STATUSES = frozenset({401, 403})  # Expired or rejected cookies; re-warm once, then stop
+AJIO_CONCURRENCY = 6
+MAX_SCRAPE_PAGES = 12
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+# HTTP/2 multiplexes all pages over one TLS connection; needs the optional h2 package (httpx[http2])
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
 USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
@@ -28,24 +39,29 @@ def get_random_ua() -> str:
 
 
 def retry_on_failure(max_retries=3, base_delay=2, backoff=2):
-    """Retry decorator with exponential backoff and jitter."""
+    """Retry decorator for coroutines with exponential backoff and jitter."""
     def decorator(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args, **kwargs):
             last_exc = None
             for attempt in range(max_retries):
                 try:
-                    return func(*args, **kwargs)
+                    return await func(*args, **kwargs)
                 except Exception as e:
                     last_exc = e
                     delay = base_delay * (backoff ** attempt) + random.uniform(0, 1)
                     logger.warning(f"Retry {attempt+1}/{max_retries} for {func.__name__} after {delay:.1f}s: {e}")
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
             logger.error(f"All {max_retries} retries failed for {func.__name__}: {last_exc}")
             return []
         return wrapper
     return decorator
 
+
+def new_http_client(headers: Optional[Dict] = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(headers=headers, limits=HTTP_LIMITS, follow_redirects=True, http2=HTTP2_ENABLED)
+
+
 _EXCLUDE_PATTERNS = [
     r'gold[- ]plated',
     r'gold plated',
@@ -62,6 +78,32 @@ _EXCLUDE_PATTERNS = [
 _EXCLUDE_RE = re.compile('|'.join(_EXCLUDE_PATTERNS), re.IGNORECASE)
  
  
+# Purity markers in priority order; one alternation scans the title once
+_PURITY_PATTERNS = [
+    ('p24', r'24\s*kt|24\s*karat|\b999\b|24k', '24K'),
+    ('p22', r'22\s*kt|22\s*karat|\b916\b|22k', '22K'),
+    ('p18', r'18\s*kt|18\s*karat|\b750\b|18k', '18K'),
+    ('p14', r'14\s*kt|14\s*karat|\b585\b|14k', '14K'),
+    ('p995', r'\b995\b', '995'),
+]
+_PURITY_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in _PURITY_PATTERNS))
+_PURITY_RANK = {name: rank for rank, (name, _, _) in enumerate(_PURITY_PATTERNS)}
+_PURITY_VALUES = {name: value for name, _, value in _PURITY_PATTERNS}
+# "1 Gms", "5 Gram", "0.5 gm" or a bare "1G", "0.3g", "0.25G" in one pass
+_WEIGHT_RE = re.compile(r'(\d+\.?\d*)\s*(?:(?:grams?|gms?|gm|gr)\b|g(?!\w))')
+_HAS_DIGIT = re.compile(r'\d').search
+_MG_RE = re.compile(r'(\d+\.?\d*)\s*mg\b')
+_MULTIPACK_RE = re.compile(r'\b(x|set of|pack of)\b')
+_ADDITION_RE = re.compile(r'\b(plus|and)\b')
+_PURITY_NUMBERS = frozenset({24, 22, 18, 14, 999, 916, 750, 585, 995})
+# Whole-word keywords (plurals allowed) so "bar" no longer matches "barrel"
+# Coin and jewellery keywords in one alternation; the named group tells which side matched
+_PRODUCT_TYPE_RE = re.compile(
+    r'\b(?:(?P<coin>coin|sovereign|bar|biscuit|ingot|bullion|investment)'
+    r'|(?P<jewellery>chain|pendant|ring|bangle|bracelet|earring|necklace|mangalsutra|jewellery|jewelry|ornament))s?\b'
+)
+
+
 def is_real_gold_product(title: str) -> bool:
     """Return False for gold-plated / fashion / non-coin products."""
     return not bool(_EXCLUDE_RE.search(title))
@@ -70,6 +112,7 @@ class GoldScraper:
     def __init__(self):
         self.price_calculator = GoldPriceCalculator()
         self._gold_data = None  # Cached per-scan gold price data
+        self._expected_price_cache: Dict[Tuple[float, str, Any], Any] = {}  # Reset with _gold_data
         self.ajio_headers = {
             'authority': 'www.ajio.com',
             'accept': 'application/json, text/plain, */*',
@@ -83,11 +126,11 @@ class GoldScraper:
             'sec-fetch-site': 'same-origin',
             'user-agent': get_random_ua(),
         }
+        self._myntra_session = None
+        self._myntra_session_created = 0.0
     
-    def create_myntra_session(self):
-        """Create and prepare a session for Myntra with proper cookies"""
-        s = requests.Session()
-        
+    async def create_myntra_session(self, client: httpx.AsyncClient):
+        """Warm up a Myntra client so it carries the proper cookies"""
         base_headers = {
             "User-Agent": get_random_ua(),
             "Accept-Language": "en-GB,en;q=0.9",
@@ -95,22 +138,42 @@ class GoldScraper:
             "Connection": "keep-alive",
         }
         
-        # First visit to generate cookies
-        s.get("https://www.myntra.com", headers=base_headers, timeout=15)
-        time.sleep(random.uniform(1, 2))
+        # First visit to generate cookies; each GET completes before the next, so no pause is needed
+        await client.get("https://www.myntra.com", headers=base_headers, timeout=15)
         
         # Visit gold coins page
-        s.get("https://www.myntra.com/gold-coin", headers=base_headers, timeout=15)
-        time.sleep(random.uniform(1, 2))
+        await client.get("https://www.myntra.com/gold-coin", headers=base_headers, timeout=15)
         
         # Set pincode cookie
-        s.cookies.set(
+        client.cookies.set(
             "mynt-ulc",
             "pincode:384345|addressId:",
             domain=".myntra.com"
         )
         
-        return s, base_headers
+        return base_headers
+
+    async def get_myntra_session(self, client: httpx.AsyncClient):
+        """Load warmed Myntra cookies into client, reusing the previous warm-up while it is fresh"""
+        if self._myntra_session is None or time.time() - self._myntra_session_created > MYNTRA_SESSION_TTL:
+            base_headers = await self.create_myntra_session(client)
+            self._myntra_session = (httpx.Cookies(client.cookies), base_headers)
+            self._myntra_session_created = time.time()
+            return base_headers
+
+        cookies, base_headers = self._myntra_session
+        client.cookies.update(cookies)
+        return base_headers
+
+    def reset_myntra_session(self):
+        self._myntra_session = None
+
+    async def rewarm_myntra_session(self, client: httpx.AsyncClient):
+        """Drop blocked cookies, pause briefly and warm up again (used once after a 401/403)"""
+        self.reset_myntra_session()
+        client.cookies.clear()
+        await asyncio.sleep(random.uniform(1, 2))
+        return await self.get_myntra_session(client)
     
     # def extract_purity_and_weight(self, title: str) -> Tuple[Optional[str], Optional[float]]:
     #     """
@@ -220,68 +283,54 @@ class GoldScraper:
     #             return purity, sum(all_weights)
         
     #     return purity, None
-    def extract_purity_and_weight(self, title: str) -> Tuple[Optional[str], Optional[float]]:
+    def extract_purity_and_weight(self, title: str, title_lower: Optional[str] = None) -> Tuple[Optional[str], Optional[float]]:
         """
         Extract purity and weight from a gold product title.
         Returns: (purity, weight_in_grams)
     
         Purity can be None for items labelled 'Pure Gold' without explicit karat.
         Weight can be None if no weight info is present in the title.
+        Callers that already lowercased the title can pass it as title_lower.
         """
-        title_lower = title.lower()
+        if title_lower is None:
+            title_lower = title.lower()
+    
+        # Every purity and weight pattern needs a digit
+        if not _HAS_DIGIT(title_lower):
+            return None, None
     
         # Quick exclusion
-        if not is_real_gold_product(title):
+        if not is_real_gold_product(title_lower):
             return None, None
     
         # ── PURITY ───────────────────────────────────────────────────────────────
         purity = None
-        purity_patterns = [
-            (r'24\s*kt|24\s*karat|\b999\b|24k', '24K'),
-            (r'22\s*kt|22\s*karat|\b916\b|22k', '22K'),
-            (r'18\s*kt|18\s*karat|\b750\b|18k', '18K'),
-            (r'14\s*kt|14\s*karat|\b585\b|14k', '14K'),
-            (r'\b995\b', '995'),
-        ]
-        for pattern, purity_value in purity_patterns:
-            if re.search(pattern, title_lower):
-                purity = purity_value
-                break
+        best_rank = len(_PURITY_PATTERNS)
+        for m in _PURITY_RE.finditer(title_lower):
+            rank = _PURITY_RANK[m.lastgroup]
+            if rank < best_rank:
+                best_rank = rank
+                purity = _PURITY_VALUES[m.lastgroup]
+                if rank == 0:
+                    break
     
         # ── WEIGHT ───────────────────────────────────────────────────────────────
-        PURITY_NUMBERS = {24, 22, 18, 14, 999, 916, 750, 585, 995}
-    
-        def is_valid_weight(n: float) -> bool:
-            return n not in PURITY_NUMBERS and 0.001 <= n <= 10_000
-    
-        # Collect all weights with their positions
-        weight_patterns = [
-            r'(\d+\.?\d*)\s*(?:grams?|gms?|gm|gr)\b',   # "1 Gms", "5 Gram", "0.5 gm"
-            r'(\d+\.?\d*)\s*g(?!\w)',                      # "1G", "0.3g", "0.25G"
-        ]
-        
-        weights_with_pos = []
-        seen_start_pos: set = set()
-        
-        for pat in weight_patterns:
-            for m in re.finditer(pat, title_lower):
-                if m.start() in seen_start_pos:
-                    continue
-                try:
-                    w = float(m.group(1))
-                    if is_valid_weight(w):
-                        weights_with_pos.append((m.start(), w))
-                        seen_start_pos.add(m.start())
-                except ValueError:
-                    continue
-        
-        # Sort by position
-        weights_with_pos.sort()
-        all_weights = [w for pos, w in weights_with_pos]
+        # Matches come back in position order and never share a start
+        all_weights = []
+        first_pos = 0
+        for m in _WEIGHT_RE.finditer(title_lower):
+            try:
+                w = float(m.group(1))
+            except ValueError:
+                continue
+            if w not in _PURITY_NUMBERS and 0.001 <= w <= 10_000:
+                if not all_weights:
+                    first_pos = m.start()
+                all_weights.append(w)
     
         if not all_weights:
             # Check for milligrams as fallback
-            mg_match = re.search(r'(\d+\.?\d*)\s*mg\b', title_lower)
+            mg_match = _MG_RE.search(title_lower)
             if mg_match:
                 w_mg = float(mg_match.group(1))
                 if 0.001 <= w_mg <= 10_000:
@@ -293,7 +342,6 @@ class GoldScraper:
     
         # Multiple weights found - intelligently decide whether to sum or take total
         first_w = all_weights[0]
-        first_pos = weights_with_pos[0][0]
         others = all_weights[1:]
         
         # CASE 1: First weight is the sum of others (e.g. "4gm (2gm+2gm)")
@@ -301,13 +349,13 @@ class GoldScraper:
             return purity, first_w
         
         # CASE 2: First weight is early and strictly greater than others (e.g. "4gm ... (2gm x 2)")
-        if first_pos < 25 and first_w > max(others) and (re.search(r'\b(x|set of|pack of)\b', title_lower) or '(' in title_lower):
+        if first_pos < 25 and first_w > max(others) and (_MULTIPACK_RE.search(title_lower) or '(' in title_lower):
             return purity, first_w
     
         # CASE 3: All weights are the same
         if all(w == first_w for w in all_weights):
             # Sum only if there's an explicit addition indicator
-            if '+' in title_lower or re.search(r'\b(plus|and)\b', title_lower):
+            if '+' in title_lower or _ADDITION_RE.search(title_lower):
                 return purity, sum(all_weights)
             # Otherwise it's likely just repeating the same weight
             return purity, first_w
@@ -317,39 +365,46 @@ class GoldScraper:
 
     
     
-    def determine_product_type(self, title: str, description: str = "") -> str:
+    def determine_product_type(self, title: str, description: str = "", title_lower: Optional[str] = None) -> str:
         """
         Determine if product is jewellery or coin/bar
         """
-        text = (title + " " + description).lower()
+        if title_lower is None:
+            title_lower = title.lower()
+        text = f"{title_lower} {description.lower()}" if description else title_lower
         
-        coin_keywords = ['coin', 'sovereign', 'bar', 'biscuit', 'ingot', 'bullion', 'investment']
-        jewellery_keywords = ['chain', 'pendant', 'ring', 'bangle', 'bracelet', 'earring', 
-                             'necklace', 'mangalsutra', 'jewellery', 'jewelry', 'ornament']
-        
-        coin_count = sum(1 for keyword in coin_keywords if keyword in text)
-        jewellery_count = sum(1 for keyword in jewellery_keywords if keyword in text)
+        # Count distinct keywords, as before, not repeated mentions
+        coin_words, jewellery_words = set(), set()
+        for coin, jewellery in _PRODUCT_TYPE_RE.findall(text):
+            if coin:
+                coin_words.add(coin)
+            else:
+                jewellery_words.add(jewellery)
         
-        if coin_count > jewellery_count:
+        if len(coin_words) > len(jewellery_words):
             return 'coin'
         else:
             return 'jewellery'
     
-    def scrape_ajio(self) -> List[Dict]:
+    async def scrape_ajio(self) -> List[Dict]:
         print("🔄 Scraping AJIO...")
         products = []
+        semaphore = asyncio.Semaphore(AJIO_CONCURRENCY)
+        total_pages = {'value': None}
+        seen_urls = set()  # Pages can overlap at their boundaries; parse each listing once
+        scrape_ts = datetime.now().isoformat()  # Shared by every product in this scrape
 
         @retry_on_failure(max_retries=3, base_delay=2)
-        def fetch_page(page: int):
+        async def fetch_page(client: httpx.AsyncClient, page: int):
             params = SEARCH_PARAMS['ajio'].copy()
             params['currentPage'] = page
 
-            r = requests.get(
-                AJIO_API_URL,
-                params=params,
-                headers=self.ajio_headers,
-                timeout=15
-            )
+            async with semaphore:
+                r = await client.get(
+                    AJIO_API_URL,
+                    params=params,
+                    timeout=15
+                )
 
             if r.status_code == 429:
                 raise Exception(f"Rate limited on page {page}")
@@ -357,27 +412,56 @@ class GoldScraper:
                 print(f"Page {page} failed with status {r.status_code}")
                 return []
 
-            data = r.json()
-            page_products = []
-
+            data = orjson.loads(r.content)
+            if page == 1:
+                total_pages['value'] = data.get("pagination", {}).get("totalPages")
+            raw_products = []
             for p in data.get("products", []):
-                parsed = self._parse_ajio_product(p)
-                if parsed:
-                    page_products.append(parsed)
+                url = p.get('url')
+                if url:
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                raw_products.append(p)
+
+            page_products = await asyncio.to_thread(
+                self._parse_batch, self._parse_ajio_product, raw_products, scrape_ts
+            )
 
             print(f"Page {page}: {len(page_products)} valid")
             return page_products
 
-        with ThreadPoolExecutor(max_workers=6) as ex:
-            futures = [ex.submit(fetch_page, p) for p in range(1, 13)]
+        # Headers live on the pooled client, so every page reuses the same kept-alive connections
+        async with new_http_client(headers=self.ajio_headers) as client:
+            # Page 1 tells us how many pages exist, so empty tail pages are never requested
+            products.extend(await fetch_page(client, 1))
+            last_page = MAX_SCRAPE_PAGES
+            if isinstance(total_pages['value'], int):
+                last_page = min(MAX_SCRAPE_PAGES, total_pages['value'])
+            pages = await asyncio.gather(*(fetch_page(client, p) for p in range(2, last_page + 1)))
 
-            for f in as_completed(futures):
-                products.extend(f.result())
+        for page_products in pages:
+            products.extend(page_products)
 
         print(f"✅ AJIO total: {len(products)}")
         return products
     
-    def _parse_ajio_product(self, product: Dict) -> Optional[Dict]:
+    def _expected_price(self, weight: float, purity: str, product_type: Any):
+        """Memoized calculate_expected_price for the current scan's gold data (read-only result)"""
+        key = (weight, purity, product_type)
+        cached = self._expected_price_cache.get(key)
+        if cached is None:
+            cached = MappingProxyType(self.price_calculator.calculate_expected_price(
+                weight, purity, product_type, gold_data=self._gold_data
+            ))
+            self._expected_price_cache[key] = cached
+        return cached
+
+    def _parse_batch(self, parser, raw_products: List[Dict], scrape_ts: str) -> List[Dict]:
+        """Parse one page of raw listings; runs in a worker thread so regex work stays off the event loop"""
+        return [parsed for parsed in (parser(p, scrape_ts) for p in raw_products) if parsed]
+
+    def _parse_ajio_product(self, product: Dict, scrape_ts: Optional[str] = None) -> Optional[Dict]:
         """Parse AJIO product data"""
         try:
             title = product.get('name', '')
@@ -388,44 +472,40 @@ class GoldScraper:
             #     print('Skipping non-gold product    :', title)
             #     return None
 
-            if 'silver' in title.lower():
+            title_lower = title.lower()
+            if 'silver' in title_lower:
                 # print('Skipping silver product    :', title)
                 return None
             
+            # Extract price first (offer price, falling back to list price); it is cheaper than the title regexes
+            selling_price = (product.get('offerPrice') or {}).get('value', 0)
+            if selling_price <= 0:
+                selling_price = (product.get('price') or {}).get('value', 0)
+            
+            # Skip if price is too low
+            if selling_price < 1000:
+                logger.debug('Skipping <1000 price product: %s', title)
+                return None
+            
             # Extract purity and weight
-            purity, weight = self.extract_purity_and_weight(title)
+            purity, weight = self.extract_purity_and_weight(title, title_lower)
             
             if not purity or not weight:
                 # print(product)
-                print('AJIO>Skipping invalid purity/weight product :', title)
+                logger.debug('AJIO>Skipping invalid purity/weight product: %s', title)
                 return None
             
             # Skip very small items
             if weight < 0.3:
-                print('Skipping <0.3 product    :', title)
+                logger.debug('Skipping <0.3 product: %s', title)
                 return None
             
             # Determine product type
-            product_type = self.determine_product_type(title, description)
+            product_type = self.determine_product_type(title, description, title_lower)
             is_jewellery = (product_type == 'jewellery')
             
-            # Extract price
-            price_data = product.get('price', {})
-            selling_price2 = price_data.get('value', 0)
-
-            price_data = product.get('offerPrice', {})
-            selling_price = price_data.get('value', 0)
-            selling_price = selling_price if selling_price > 0 else selling_price2
-            
-            # Skip if price is too low
-            if selling_price < 1000:
-                print('Skipping <1000 price product    :', title)
-                return None
-            
             # Calculate expected price
-            expected_price_info = self.price_calculator.calculate_expected_price(
-                weight, purity, is_jewellery, gold_data=self._gold_data
-            )
+            expected_price_info = self._expected_price(weight, purity, is_jewellery)
             # print(weight, purity, is_jewellery)
             # print(expected_price_info);
             expected_price = expected_price_info['total_expected']
@@ -437,6 +517,7 @@ class GoldScraper:
             
             # Calculate price per gram
             price_per_gram = selling_price / weight
+            images = product.get('images')
             # print({
             #     'source': 'AJIO',
             #     'title': title,
@@ -470,24 +551,28 @@ class GoldScraper:
                 'discount_percent': discount_percent,
                 'price_per_gram': round(price_per_gram, 2),
                 'url': f"https://www.ajio.com{product.get('url', '')}",
-                'image_url': product.get('images', [{}])[0].get('url', '') if product.get('images') else '',
-                'brand': product.get('fnlColorVariantData', {}).get('brandName', 'Unknown'),
+                'image_url': images[0].get('url', '') if images else '',
+                'brand': (product.get('fnlColorVariantData') or {}).get('brandName', 'Unknown'),
                 'spot_price': expected_price_info['spot_price_per_gram'],
                 'making_charges_percent': expected_price_info['making_charges_percent'],
                 'gst_percent': expected_price_info['gst_percent'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': scrape_ts or datetime.now().isoformat()
             }
             
         except Exception as e:
             print(f"Error parsing AJIO product: {e}")
             return None
     
-    def scrape_myntra(self) -> List[Dict]:
+    async def scrape_myntra(self) -> List[Dict]:
         print("🔄 Scraping Myntra...")
+        async with new_http_client() as client:
+            return await self._scrape_myntra_pages(client)
+
+    async def _scrape_myntra_pages(self, client: httpx.AsyncClient) -> List[Dict]:
         products = []
 
-        # Single session warmup — reused across all pages
-        session, base_headers = self.create_myntra_session()
+        # Single session warmup — reused across all pages and recent scans
+        base_headers = await self.get_myntra_session(client)
 
         api_headers = {
             "User-Agent": base_headers["User-Agent"],
@@ -497,39 +582,67 @@ class GoldScraper:
             "x-requested-with": "browser",
         }
 
-        for page in range(1, 13):
+        async def get_page(params):
+            return await client.get(
+                "https://www.myntra.com/gateway/v4/search/gold-coin",
+                params=params,
+                headers=api_headers,
+                timeout=20,
+            )
+
+        total_count = None
+        rewarmed = False
+        seen_urls = set()  # Offsets overlap by one listing per page; parse each listing once
+        scrape_ts = datetime.now().isoformat()  # Shared by every product in this scrape
+        for page in range(1, MAX_SCRAPE_PAGES + 1):
             params = {
                 "rows": 50,
                 "o": (49 * (page - 1)) + 1,
                 "pincode": "384315",
             }
+            if total_count is not None and params["o"] >= total_count:
+                break  # Past the last result
 
             try:
-                time.sleep(random.uniform(0.3, 0.8))  # Jitter between pages
-                r = session.get(
-                    "https://www.myntra.com/gateway/v4/search/gold-coin",
-                    params=params,
-                    headers=api_headers,
-                    timeout=20,
-                )
+                await asyncio.sleep(random.uniform(0.3, 0.8))  # Jitter between pages
+                r = await get_page(params)
+                if r.status_code in MYNTRA_BLOCKED_STATUSES and not rewarmed:
+                    logger.warning(f"Myntra blocked on page {page} — re-warming session once")
+                    rewarmed = True
+                    base_headers = await self.rewarm_myntra_session(client)
+                    api_headers["User-Agent"] = base_headers["User-Agent"]
+                    r = await get_page(params)
 
                 if r.status_code == 429:
                     logger.warning(f"Myntra rate limited on page {page} — backing off")
-                    time.sleep(random.uniform(10, 20))
+                    await asyncio.sleep(random.uniform(10, 20))
                     continue
-                if r.status_code == 403:
+                if r.status_code in MYNTRA_BLOCKED_STATUSES:
                     logger.warning(f"Myntra blocked on page {page} — stopping")
+                    self.reset_myntra_session()
                     break
                 if r.status_code != 200:
                     continue
 
-                data = r.json()
-                for p in data.get("products", []):
-                    parsed = self._parse_myntra_product(p)
-                    if parsed:
-                        products.append(parsed)
-
-                print(f"Page {page}: {sum(1 for p in data.get('products', []))} raw, running total {len(products)}")
+                data = orjson.loads(r.content)
+                if isinstance(data.get("totalCount"), int):
+                    total_count = data["totalCount"]
+                raw_products = data.get("products", [])
+                new_products = []
+                for p in raw_products:
+                    url = p.get('landingPageUrl')
+                    if url:
+                        if url in seen_urls:
+                            continue
+                        seen_urls.add(url)
+                    new_products.append(p)
+                products.extend(await asyncio.to_thread(
+                    self._parse_batch, self._parse_myntra_product, new_products, scrape_ts
+                ))
+
+                print(f"Page {page}: {len(raw_products)} raw, running total {len(products)}")
+                if not raw_products:
+                    break
 
             except Exception as e:
                 logger.error(f"Myntra page {page} error: {e}")
@@ -569,14 +682,14 @@ class GoldScraper:
             print(f"Error extracting Myntra price: {e}")
             return 0, 0
     
-    def _parse_myntra_product(self, product: Dict) -> Optional[Dict]:
+    def _parse_myntra_product(self, product: Dict, scrape_ts: Optional[str] = None) -> Optional[Dict]:
         """Parse Myntra product data with improved price handling"""
         try:
             title = product.get('productName', '')
             
             # Skip if no title
             if not title:
-                print('Skipping Myntra price product    :', title)
+                logger.debug('Skipping Myntra price product: %s', title)
                 return None
             
             # Skip non-gold products
@@ -584,40 +697,39 @@ class GoldScraper:
             #     print('Skipping not gold product    :', title)
             #     return None
         
-            if 'silver' in title.lower():
+            title_lower = title.lower()
+            if 'silver' in title_lower:
                 # print('Skipping silver  product    :', title)
                 return None
             
+            # Extract price first - handle different formats; it is cheaper than the title regexes
+            price_data = product.get('price')
+            selling_price, original_price = self._extract_myntra_price(price_data)
+            
+            # Skip if price is too low
+            if selling_price < 1000:
+                logger.debug('Skipping very small price <1000 product: %s', title)
+                return None
+            
             # Extract purity and weight
-            purity, weight = self.extract_purity_and_weight(title)
+            purity, weight = self.extract_purity_and_weight(title, title_lower)
             
             if not purity or not weight:
                 # print(product);
-                print('Myntra>Skipping invalid purity/weight product    :', title)
+                logger.debug('Myntra>Skipping invalid purity/weight product: %s', title)
                 return None
             
             # Skip very small items
             if weight < 0.3:
-                print('Skipping very small weight < 0.3 product    :', title)
+                logger.debug('Skipping very small weight < 0.3 product: %s', title)
                 return None
             
             # Determine product type from title
-            product_type = self.determine_product_type(title)
+            product_type = self.determine_product_type(title, title_lower=title_lower)
             is_jewellery = (product_type == 'jewellery')
             
-            # Extract price - handle different formats
-            price_data = product.get('price')
-            selling_price, original_price = self._extract_myntra_price(price_data)
-            
-            # Skip if price is too low
-            if selling_price < 1000:
-                print('Skipping very small price <1000 product    :', title)
-                return None
-            
             # Calculate expected price
-            expected_price_info = self.price_calculator.calculate_expected_price(
-                weight, purity, is_jewellery, gold_data=self._gold_data
-            )
+            expected_price_info = self._expected_price(weight, purity, is_jewellery)
             expected_price = expected_price_info['total_expected']
             # print(expected_price,weight, purity, is_jewellery)
             # print(expected_price_info)
@@ -674,7 +786,7 @@ class GoldScraper:
                 'spot_price': expected_price_info['spot_price_per_gram'],
                 'making_charges_percent': expected_price_info['making_charges_percent'],
                 'gst_percent': expected_price_info['gst_percent'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': scrape_ts or datetime.now().isoformat()
             }
             
         except Exception as e:
@@ -683,42 +795,62 @@ class GoldScraper:
             traceback.print_exc()
             return None
     
-    def scrape_all(self) -> List[Dict]:
+    async def scrape_all_async(self) -> List[Dict]:
         # Fetch gold price ONCE per scan cycle — avoids 400+ cache reads
-        self._gold_data = self.price_calculator.get_live_gold_price()
+        self._gold_data = await asyncio.to_thread(self.price_calculator.get_live_gold_price)
+        self._expected_price_cache.clear()
         logger.info(f"Gold price fetched: {self._gold_data.get('spot_price_per_gram', 'N/A')}/g ({self._gold_data.get('source', 'unknown')})")
 
         # Randomize UA per scan cycle
         self.ajio_headers['user-agent'] = get_random_ua()
 
-        with ThreadPoolExecutor(max_workers=2) as ex:
-            f1 = ex.submit(self.scrape_ajio)
-            f2 = ex.submit(self.scrape_myntra)
+        # Both sources run concurrently; one failing source no longer discards the other's results
+        results = await asyncio.gather(self.scrape_ajio(), self.scrape_myntra(), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
 
-            ajio_products = f1.result()
-            myntra_products = f2.result()
-
-        all_products = ajio_products + myntra_products
+        all_products = []
+        for source, result in zip(('AJIO', 'Myntra'), results):
+            if isinstance(result, BaseException):
+                logger.error(f"{source} scrape failed: {result}")
+                continue
+            all_products.extend(result)
         print(f"\n📊 Total products: {len(all_products)}")
 
         return all_products
 
+    def scrape_all(self) -> List[Dict]:
+        """Synchronous entry point for scripts and non-async callers"""
+        return asyncio.run(self.scrape_all_async())
+
     def scrape_all_with_cache(self, force_refresh=False):
         """Scrape all sources with caching"""
         cache_file = "data/latest_scan.json"
         
-        # Check cache if not forcing refresh
-        if not force_refresh and os.path.exists(cache_file):
-            cache_age = time.time() - os.path.getmtime(cache_file)
-            if cache_age < 300:  # 5 minutes cache
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
+        # Check cache if not forcing refresh (one open + fstat instead of exists/getmtime)
+        if not force_refresh:
+            try:
+                with open(cache_file, 'rb') as f:
+                    cache_age = time.time() - os.fstat(f.fileno()).st_mtime
+                    if cache_age < 300:  # 5 minutes cache
+                        return orjson.loads(f.read())
+            except FileNotFoundError:
+                pass
         
         # Perform fresh scrape
         products = self.scrape_all()
         
-        # Save to cache
-        with open(cache_file, 'w') as f:
-            json.dump(products, f)
+        # Save to cache atomically so a crash never leaves a truncated file behind
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(products))
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
         return products
\ No newline at end of file
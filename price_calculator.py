@@ -1,14 +1,17 @@
-import json
+import orjson
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import fcntl
+import tempfile
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from typing import Dict, Optional, Tuple
 from config import GST_RATE, PURITY_MAPPING
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
 logger = logging.getLogger(__name__)
@@ -18,7 +21,9 @@ class GoldPriceCalculator:
     _lock = threading.Lock()
     
     def __new__(cls):
-        # Singleton pattern to ensure only one instance exists
+        # Singleton pattern to ensure only one instance exists; lock only until it does
+        if cls._instance is not None:
+            return cls._instance
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
@@ -45,9 +50,36 @@ class GoldPriceCalculator:
         
         self.CACHE_FILE = Path("bullion_cache.json")
         self.CACHE_TTL = 300  # 5 minutes cache
-        self._last_api_call = 0
+        self._last_api_call = 0.0  # time.monotonic() of the last live fetch
         self._cache_lock = threading.Lock()
         self._min_api_interval = 2  # Minimum seconds between API calls
+        self._mem_cache: Optional[Dict] = None  # Parsed copy of CACHE_FILE
+        self._mem_cache_key: Optional[Tuple[int, int]] = None  # (st_mtime_ns, st_size) it was parsed from
+        self._mem_cache_expires = 0.0  # Epoch seconds when _mem_cache leaves CACHE_TTL
+        self._summary_cache: Optional[Tuple[Tuple[str, str], str]] = None  # ((timestamp, source), rendered summary)
+        
+        # One pooled session so repeated price fetches reuse kept-alive TLS connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36',
+            'Accept': 'application/json',
+        })
+        # Connections are pooled here; retries happen in _request_endpoint so they stay inside the fetch budget
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+        self.MAX_RETRIES = 3  # Status retries per endpoint; a timed-out read fails straight through
+        self.RETRY_BACKOFF = 0.3  # Seconds before the first retry, doubling after each
+        self.CONNECT_TIMEOUT = 3.05
+        self.READ_TIMEOUT = 8
+        
+        # Circuit breaker: skip an endpoint for a cool-down after repeated failures
+        self.BREAKER_THRESHOLD = 3  # Consecutive failures before the endpoint is skipped
+        self.BREAKER_COOLDOWN = 60  # Seconds to skip it; the next call after that is a probe
+        self.FETCH_BUDGET = 10.0  # Seconds before get_live_gold_price stops trying further endpoints
+        self._breaker = {endpoint['name']: {'fails': 0, 'open_until': 0.0} for endpoint in self.API_ENDPOINTS}
+        
+        # Validators and decoded body of each endpoint's last 200, for conditional GETs
+        self._endpoint_state = {endpoint['name']: {'etag': None, 'last_mod': None, 'last_data': None} for endpoint in self.API_ENDPOINTS}
         
         # Constants
         self.OZ_TO_GRAM = 31.1035
@@ -55,6 +87,12 @@ class GoldPriceCalculator:
         self.RETAIL_SPREAD = 700  # For 10g
         self.RTGS_DISCOUNT = 600  # For 10g
         self.JEWELLERY_PREMIUM_22K = 1200  # For 10g
+        self.PURITY_22K = 0.9167
+        
+        # Fixed multipliers, folded once instead of on every price build
+        self._gst_frac = GST_RATE / 100
+        self._gst_mult = 1 + self._gst_frac
+        self._landed_22k_factor = self.LANDED_MULTIPLIER * self.PURITY_22K
         
         # Making charges percentages
         self.MAKING_CHARGES = {
@@ -65,6 +103,11 @@ class GoldPriceCalculator:
             'jewellery_18K': 0.00, # 15% for 18K jewellery
             'jewellery_14K': 0.00, # 18% for 14K jewellery
         }
+        # Fallback when a purity has no entry above
+        self._default_making = {'jewellery': 0.12, 'coin': 0.04}
+        
+        # Price-summary badge per source; anything else is the hardcoded fallback
+        self._SOURCE_EMOJI = {'live_api': '🟢', 'cached_fallback': '🟡'}
         
         self._initialized = True
     
@@ -77,40 +120,57 @@ class GoldPriceCalculator:
             silver_products = response_data['silverProducts']
             gold_by_karat = response_data['goldByKarat']
             
+            # Convert each quoted 10g price once
+            spot_10g = float(spot['gldInr'])
+            retail_999 = float(gold_products['retail999'])
+            rtgs_999 = float(gold_products['rtgs999'])
+            with_gst_999 = float(gold_products['withGst999'])
+            retail_22k = float(gold_by_karat['22K'])
+            silver_kg = float(silver_products['retail999'])
+            
+            karat_rates_10g = {}
+            for karat, rate in gold_by_karat.items():
+                try:
+                    karat_rates_10g[karat] = float(rate)
+                except (TypeError, ValueError):
+                    continue
+            
             # Calculate per gram prices from 10g prices
-            gold_per_gram = float(gold_products['retail999']) / 10
+            gold_per_gram = retail_999 / 10
             
             # Create output structure matching our expected format
             output = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "cache_epoch": time.time(),
                 "source": "live_api",
                 "spot_price_per_gram": round(gold_per_gram, 2),
                 "gold": {
-                    "spot_10g": round(float(spot['gldInr']), 2),
-                    "retail_999_10g": round(float(gold_products['retail999']), 2),
-                    "rtgs_999_10g": round(float(gold_products['rtgs999']), 2),
-                    "999_with_gst_10g": round(float(gold_products['withGst999']), 2),
-                    "retail_22k_10g": round(float(gold_by_karat['22K']), 2),
-                    "retail_22k_with_gst_10g": round(float(gold_by_karat['22K']) * (1 + GST_RATE/100), 2),
+                    "spot_10g": round(spot_10g, 2),
+                    "retail_999_10g": round(retail_999, 2),
+                    "rtgs_999_10g": round(rtgs_999, 2),
+                    "999_with_gst_10g": round(with_gst_999, 2),
+                    "retail_22k_10g": round(retail_22k, 2),
+                    "retail_22k_with_gst_10g": round(retail_22k * self._gst_mult, 2),
                     "per_gram": {
-                        "999_spot": round(float(spot['gldInr']) / 10, 2),
-                        "999_landed": round(float(gold_products['withGst999']) / 10, 2),
-                        "22k_spot": round(float(gold_by_karat['22K']) / 10, 2),
-                        "22k_landed": round(float(gold_by_karat['22K']) / 10, 2),
+                        "999_spot": round(spot_10g / 10, 2),
+                        "999_landed": round(with_gst_999 / 10, 2),
+                        "22k_spot": round(retail_22k / 10, 2),
+                        "22k_landed": round(retail_22k / 10, 2),
                     }
                 },
                 "silver": {
-                    "per_gram": round(float(silver_products['retail999']) / 1000, 2),
-                    "per_kg": round(float(silver_products['retail999']), 2)
+                    "per_gram": round(silver_kg / 1000, 2),
+                    "per_kg": round(silver_kg, 2)
                 },
-                "raw_api_response": response_data  # Store original for reference if needed
+                # Only the per-karat 10g rates are read back (by calculate_expected_price)
+                "gold_by_karat": karat_rates_10g
             }
             
-            logger.info(f"Successfully parsed myb-be response")
+            logger.info("Successfully parsed myb-be response")
             return output
             
         except (KeyError, ValueError) as e:
-            logger.error(f"Error parsing myb-be response: {e}")
+            logger.error("Error parsing myb-be response: %s", e)
             raise
     
     def _parse_goldprice_response(self, response_data: Dict) -> Dict:
@@ -120,137 +180,174 @@ class GoldPriceCalculator:
             xau = float(item["xauPrice"])  # Gold price per troy ounce in INR
             xag = float(item["xagPrice"])  # Silver price per troy ounce in INR
             
-            # Calculate all prices from spot
-            gold_per_gram = xau / self.OZ_TO_GRAM
-            silver_per_gram = xag / self.OZ_TO_GRAM
-            
-            spot_10g = gold_per_gram * 10
-            landed_10g = spot_10g * self.LANDED_MULTIPLIER
-            
-            # 24K (999) prices for 10g
-            retail_999 = landed_10g + self.RETAIL_SPREAD
-            rtgs_999 = landed_10g - self.RTGS_DISCOUNT
-            gst_999 = rtgs_999
-            
-            # 22K prices for 10g
-            base_22k = landed_10g * 0.9167
-            retail_22k = base_22k + self.JEWELLERY_PREMIUM_22K
-            retail_22k_gst = retail_22k * (1 + GST_RATE/100)
-            
-            return {
-                "timestamp": datetime.utcnow().isoformat(),
-                "source": "live_api",
-                "spot_price_per_gram": round(gold_per_gram, 2),
-                "gold": {
-                    "spot_10g": round(spot_10g, 2),
-                    "retail_999_10g": round(retail_999, 2),
-                    "rtgs_999_10g": round(rtgs_999, 2),
-                    "999_with_gst_10g": round(gst_999, 2),
-                    "retail_22k_10g": round(retail_22k, 2),
-                    "retail_22k_with_gst_10g": round(retail_22k_gst, 2),
-                    "per_gram": {
-                        "999_spot": round(gold_per_gram, 2),
-                        "999_landed": round(gold_per_gram * self.LANDED_MULTIPLIER, 2),
-                        "22k_spot": round(gold_per_gram * 0.9167, 2),
-                        "22k_landed": round((gold_per_gram * 0.9167) * self.LANDED_MULTIPLIER, 2),
-                    }
-                },
-                "silver": {
-                    "per_gram": round(silver_per_gram, 2),
-                    "per_kg": round(silver_per_gram * 1000, 2)
-                }
-            }
+            return self._build_price_dict(xau / self.OZ_TO_GRAM, xag / self.OZ_TO_GRAM, "live_api")
         except (KeyError, IndexError, ValueError) as e:
-            logger.error(f"Error parsing goldprice response: {e}")
+            logger.error("Error parsing goldprice response: %s", e)
             raise
     
     def _read_cache_safe(self) -> Optional[Dict]:
-        """Safely read cache file with file locking"""
-        if not self.CACHE_FILE.exists():
+        """Safely read cache file with file locking; re-parses only when the file changed"""
+        try:
+            stat = self.CACHE_FILE.stat()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Error reading cache: %s", e)
             return None
         
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        if self._mem_cache is not None and cache_key == self._mem_cache_key:
+            return self._mem_cache
+        
         try:
-            with open(self.CACHE_FILE, 'r') as f:
+            with open(self.CACHE_FILE, 'rb') as f:
                 # Acquire shared lock for reading
                 fcntl.flock(f, fcntl.LOCK_SH)
                 try:
-                    data = json.load(f)
+                    data = orjson.loads(f.read())
+                    self._remember_cache(data, cache_key)
                     return data
                 finally:
                     fcntl.flock(f, fcntl.LOCK_UN)
-        except (json.JSONDecodeError, OSError, IOError) as e:
-            logger.warning(f"Error reading cache: {e}")
+        except (orjson.JSONDecodeError, OSError, IOError) as e:
+            logger.warning("Error reading cache: %s", e)
             return None
     
     def _write_cache_safe(self, data: Dict) -> bool:
         """Safely write to cache file with file locking"""
         try:
-            # Write to temporary file first
-            temp_file = self.CACHE_FILE.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
-            
-            # Atomic rename
-            temp_file.replace(self.CACHE_FILE)
+            # Write to a uniquely named temporary file first, so the API and the
+            # scanner never interleave writes into one shared .tmp path
+            fd, temp_path = tempfile.mkstemp(dir=self.CACHE_FILE.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(orjson.dumps(data))  # Compact; nothing reads this file by eye
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                # Atomic rename
+                os.replace(temp_path, self.CACHE_FILE)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            stat = self.CACHE_FILE.stat()
+            self._remember_cache(data, (stat.st_mtime_ns, stat.st_size))
             return True
         except Exception as e:
-            logger.error(f"Error saving cache: {e}")
+            logger.error("Error saving cache: %s", e)
             return False
     
-    def _is_cache_valid(self, cached_data: Dict) -> bool:
-        """Check if cached data is still valid"""
+    def _remember_cache(self, data: Dict, cache_key: Tuple[int, int]) -> None:
+        """Keep the parsed cache in memory, parsing its timestamp once into an expiry"""
+        # Expire first and publish the new expiry last, so lock-free readers (which read
+        # the expiry before the dict) never pair an old dict with a newer expiry
+        self._mem_cache_expires = 0.0
+        self._mem_cache, self._mem_cache_key = data, cache_key
+        self._mem_cache_expires = self._cache_expiry(data)
+    
+    def _cache_expiry(self, cached_data: Dict) -> float:
+        """Epoch seconds until which cached data is still valid (0 if its timestamp is unusable)"""
+        cache_epoch = cached_data.get('cache_epoch')
+        if isinstance(cache_epoch, (int, float)):
+            return cache_epoch + self.CACHE_TTL
+        # Cache files written before cache_epoch existed only carry the ISO timestamp
         try:
             cache_timestamp = datetime.fromisoformat(cached_data.get('timestamp', '2000-01-01'))
-            return datetime.now() - cache_timestamp < timedelta(seconds=self.CACHE_TTL)
+            return cache_timestamp.timestamp() + self.CACHE_TTL
         except (ValueError, TypeError):
-            return False
+            return 0.0
     
-    def _fetch_from_api(self, endpoint_config: Dict) -> Optional[Dict]:
-        """Fetch gold price from a specific API endpoint and return complete data"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36',
-                'Accept': 'application/json',
-            }
+    def _fetch_from_api(self, endpoint_config: Dict, deadline: Optional[float] = None) -> Optional[Dict]:
+        """Fetch gold price from a specific API endpoint, skipping it while its circuit is open"""
+        breaker = self._breaker.setdefault(endpoint_config['name'], {'fails': 0, 'open_until': 0.0})
+        if time.monotonic() < breaker['open_until']:
+            logger.info("Skipping %s API: circuit open after repeated failures", endpoint_config['name'])
+            return None
+        
+        output = self._request_endpoint(endpoint_config, deadline)
+        if output is None:
+            breaker['fails'] += 1
+            if breaker['fails'] >= self.BREAKER_THRESHOLD:
+                breaker['open_until'] = time.monotonic() + self.BREAKER_COOLDOWN
+                logger.warning("%s failed %s times in a row; skipping it for %ss", endpoint_config['name'], breaker['fails'], self.BREAKER_COOLDOWN)
+        else:
+            breaker['fails'] = 0
+            breaker['open_until'] = 0.0
+        return output
+    
+    def _request_endpoint(self, endpoint_config: Dict, deadline: Optional[float] = None) -> Optional[Dict]:
+        """Fetch gold price from a specific API endpoint and return complete data
 
-            # Add custom headers if provided
-            if 'headers' in endpoint_config:
-                headers.update(endpoint_config['headers'])
-            
+        deadline is a time.monotonic() value; every attempt's timeouts and retry waits end by it.
+        """
+        try:
             params = endpoint_config.get('params', {})
+            state = self._endpoint_state.setdefault(endpoint_config['name'], {'etag': None, 'last_mod': None, 'last_data': None})
             
-            logger.info(f"Trying {endpoint_config['name']} API...")
-            response = requests.get(
-                endpoint_config['url'],
-                headers=headers,
-                params=params,
-                timeout=15
-            )
+            # Session headers apply to every call; custom endpoint headers are merged on top
+            headers = dict(endpoint_config.get('headers') or {})
+            if state['last_data'] is not None:
+                if state['etag']:
+                    headers['If-None-Match'] = state['etag']
+                if state['last_mod']:
+                    headers['If-Modified-Since'] = state['last_mod']
+            
+            logger.info("Trying %s API...", endpoint_config['name'])
+            for attempt in range(self.MAX_RETRIES + 1):
+                timeout = (self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning("%s ran out of fetch budget", endpoint_config['name'])
+                        return None
+                    timeout = (min(self.CONNECT_TIMEOUT, remaining), min(self.READ_TIMEOUT, remaining))
+                response = self.session.get(
+                    endpoint_config['url'],
+                    headers=headers,
+                    params=params,
+                    timeout=timeout
+                )
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                    break
+                backoff = self.RETRY_BACKOFF * (2 ** attempt)
+                if deadline is not None and time.monotonic() + backoff >= deadline:
+                    break
+                logger.info("%s returned status %s; retrying in %ss", endpoint_config['name'], response.status_code, backoff)
+                time.sleep(backoff)
+            
+            # Unchanged since the last fetch: re-run the parser on the body we already decoded
+            if response.status_code == 304 and state['last_data'] is not None:
+                output = endpoint_config['parser'](state['last_data'])
+                logger.info("%s unchanged (304); reused last response", endpoint_config['name'])
+                return output
             
             # Check if response is valid
             if response.status_code != 200:
-                logger.warning(f"{endpoint_config['name']} returned status {response.status_code}")
+                logger.warning("%s returned status %s", endpoint_config['name'], response.status_code)
                 return None
             
             # Try to parse JSON
             try:
-                data = response.json()
-            except json.JSONDecodeError:
-                logger.warning(f"{endpoint_config['name']} returned invalid JSON")
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                logger.warning("%s returned invalid JSON", endpoint_config['name'])
                 return None
             
             # Parse using the endpoint's parser
             output = endpoint_config['parser'](data)
-            logger.info(f"Successfully fetched from {endpoint_config['name']}")
+            state.update(
+                etag=response.headers.get('ETag'),
+                last_mod=response.headers.get('Last-Modified'),
+                last_data=data,
+            )
+            logger.info("Successfully fetched from %s", endpoint_config['name'])
             return output
             
         except requests.RequestException as e:
-            logger.warning(f"Network error with {endpoint_config['name']}: {e}")
+            logger.warning("Network error with %s: %s", endpoint_config['name'], e)
             return None
         except Exception as e:
-            logger.warning(f"Error with {endpoint_config['name']}: {e}")
+            logger.warning("Error with %s: %s", endpoint_config['name'], e)
             return None
     
     def get_live_gold_price(self, force_refresh: bool = False) -> Dict:
@@ -260,34 +357,48 @@ class GoldPriceCalculator:
         Args:
             force_refresh: If True, bypass cache and fetch fresh data
         """
-        # Use lock to prevent multiple simultaneous API calls
+        # Cache hits need no lock; only a refresh is serialized
+        if not force_refresh:
+            expires = self._mem_cache_expires
+            cached_data = self._mem_cache
+            if cached_data and time.time() < expires:
+                return cached_data
+        
+        # Use lock to prevent multiple simultaneous API calls; threads that queued
+        # here behind a refresh find it in the in-memory copy below
         with self._cache_lock:
-            # Check cache first (unless force refresh)
+            # Check cache first (unless force refresh); a fresh in-memory copy needs no stat or parse
             if not force_refresh:
+                if self._mem_cache and time.time() < self._mem_cache_expires:
+                    return self._mem_cache
+                # A successful read refreshes _mem_cache and its expiry
                 cached_data = self._read_cache_safe()
-                if cached_data and self._is_cache_valid(cached_data):
+                if cached_data and time.time() < self._mem_cache_expires:
                     logger.info("Using cached gold prices")
                     return cached_data
             
             # Check if we recently made an API call (rate limiting)
-            current_time = time.time()
+            current_time = time.monotonic()
             if current_time - self._last_api_call < self._min_api_interval:
                 logger.info("Rate limiting: using cache or fallback")
                 cached_data = self._read_cache_safe()
                 if cached_data:
-                    # Mark as cached but return it
-                    cached_data['source'] = 'cached_rate_limited'
-                    return cached_data
+                    # Mark a copy as cached; the parsed cache itself stays untouched
+                    return {**cached_data, 'source': 'cached_rate_limited'}
                 # If no cache, wait a bit
                 time.sleep(self._min_api_interval)
             
-            # Try multiple APIs
+            # Try multiple APIs, within one wall-clock budget for the whole chain, retries and timeouts included
             output = None
+            deadline = time.monotonic() + self.FETCH_BUDGET
             for endpoint in self.API_ENDPOINTS:
-                result = self._fetch_from_api(endpoint)
+                if time.monotonic() > deadline:
+                    logger.warning("Gold price fetch budget of %ss spent; skipping remaining APIs", self.FETCH_BUDGET)
+                    break
+                result = self._fetch_from_api(endpoint, deadline)
                 if result:
                     output = result
-                    self._last_api_call = time.time()
+                    self._last_api_call = time.monotonic()
                     break
             
             # If all APIs fail, use fallback calculation
@@ -307,30 +418,32 @@ class GoldPriceCalculator:
         # Try to get last cached price
         cached_data = self._read_cache_safe()
         if cached_data:
-            # Mark as fallback
-            cached_data['source'] = 'cached_fallback'
-            cached_data['timestamp'] = datetime.utcnow().isoformat()
-            return cached_data
+            # Mark a copy as fallback; the parsed cache itself stays untouched
+            return {**cached_data, 'source': 'cached_fallback', 'timestamp': datetime.now(timezone.utc).isoformat()}
         
         # Hardcoded fallback prices (based on recent averages)
         gold_per_gram = 7010.4176  # Conservative estimate
-        
-        # Calculate based on fallback
+        return self._build_price_dict(gold_per_gram, gold_per_gram / 80, "hardcoded_fallback")
+    
+    def _build_price_dict(self, gold_per_gram: float, silver_per_gram: float, source: str) -> Dict:
+        """Derive the full price structure from spot gold and silver prices per gram"""
         spot_10g = gold_per_gram * 10
         landed_10g = spot_10g * self.LANDED_MULTIPLIER
         
+        # 24K (999) prices for 10g
         retail_999 = landed_10g + self.RETAIL_SPREAD
         rtgs_999 = landed_10g - self.RTGS_DISCOUNT
-        gst_999 = rtgs_999 * (1 + GST_RATE/100)
+        gst_999 = rtgs_999 * self._gst_mult
         
-        base_22k = landed_10g * 0.9167
-        retail_22k = base_22k + self.JEWELLERY_PREMIUM_22K
-        retail_22k_gst = retail_22k * (1 + GST_RATE/100)
+        # 22K prices for 10g
+        retail_22k = landed_10g * self.PURITY_22K + self.JEWELLERY_PREMIUM_22K
+        retail_22k_gst = retail_22k * self._gst_mult
         
         return {
-            "timestamp": datetime.utcnow().isoformat(),
-            "source": "hardcoded_fallback",
-            "spot_price_per_gram": gold_per_gram,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "cache_epoch": time.time(),
+            "source": source,
+            "spot_price_per_gram": round(gold_per_gram, 2),
             "gold": {
                 "spot_10g": round(spot_10g, 2),
                 "retail_999_10g": round(retail_999, 2),
@@ -339,15 +452,15 @@ class GoldPriceCalculator:
                 "retail_22k_10g": round(retail_22k, 2),
                 "retail_22k_with_gst_10g": round(retail_22k_gst, 2),
                 "per_gram": {
-                    "999_spot": gold_per_gram,
+                    "999_spot": round(gold_per_gram, 2),
                     "999_landed": round(gold_per_gram * self.LANDED_MULTIPLIER, 2),
-                    "22k_spot": round(gold_per_gram * 0.9167, 2),
-                    "22k_landed": round((gold_per_gram * 0.9167) * self.LANDED_MULTIPLIER, 2),
+                    "22k_spot": round(gold_per_gram * self.PURITY_22K, 2),
+                    "22k_landed": round(gold_per_gram * self._landed_22k_factor, 2),
                 }
             },
             "silver": {
-                "per_gram": round(gold_per_gram / 80, 2),
-                "per_kg": round(gold_per_gram / 80 * 1000, 2)
+                "per_gram": round(silver_per_gram, 2),
+                "per_kg": round(silver_per_gram * 1000, 2)
             }
         }
     
@@ -374,9 +487,13 @@ class GoldPriceCalculator:
             base_price_per_gram = gold_data['gold']['per_gram']['999_landed']
         else:
             # For other purities, use the karat price from API if available, otherwise calculate
-            if 'raw_api_response' in gold_data and 'goldByKarat' in gold_data['raw_api_response']:
+            karat_rates_10g = gold_data.get('gold_by_karat')
+            if karat_rates_10g is None and 'goldByKarat' in gold_data.get('raw_api_response', {}):
+                # Cache files written before gold_by_karat kept the whole API response
+                karat_rates_10g = gold_data['raw_api_response']['goldByKarat']
+            if karat_rates_10g is not None:
                 # Use the exact karat price from API
-                karat_price_10g = float(gold_data['raw_api_response']['goldByKarat'].get(purity, 0))
+                karat_price_10g = float(karat_rates_10g.get(purity, 0))
                 if karat_price_10g > 0:
                     base_price_per_gram = karat_price_10g / 10
                 else:
@@ -398,14 +515,14 @@ class GoldPriceCalculator:
         # Get making charges percentage
         making_charges_percent = self.MAKING_CHARGES.get(
             charges_key, 
-            0.12 if product_type == 'jewellery' else 0.04
+            self._default_making.get(product_type, 0.04)
         )
         
         # Calculate making charges
         making_charges = gold_value * making_charges_percent
         
         # Calculate GST
-        gst_amount = (gold_value + making_charges) * (GST_RATE/100)
+        gst_amount = (gold_value + making_charges) * self._gst_frac
         
         # Total expected price
         total_expected = gold_value + making_charges + gst_amount
@@ -447,8 +564,13 @@ class GoldPriceCalculator:
         gold = gold_data['gold']
         source = gold_data.get('source', 'live_api')
         
+        # Reuse the rendered text while the same price snapshot is being served
+        summary_key = (gold_data['timestamp'], source)
+        if self._summary_cache and self._summary_cache[0] == summary_key:
+            return self._summary_cache[1]
+        
         # Source emoji
-        source_emoji = "🟢" if source == 'live_api' else "🟡" if source == 'cached_fallback' else "🔴"
+        source_emoji = self._SOURCE_EMOJI.get(source, "🔴")
         
         summary = f"""
 {source_emoji} <b>Current Gold Prices</b> {source_emoji}
@@ -467,45 +589,53 @@ class GoldPriceCalculator:
 <i>Source: {source.replace('_', ' ').title()}
 Last updated: {datetime.fromisoformat(gold_data['timestamp']).strftime('%d %b %Y, %I:%M %p')}</i>
 """
+        self._summary_cache = (summary_key, summary)
         return summary
     
     def test_api_connectivity(self) -> Dict:
         """Test connectivity to all APIs"""
-        results = {}
-        
-        for endpoint in self.API_ENDPOINTS:
+        def probe(endpoint: Dict) -> Dict:
             try:
-                logger.info(f"Testing {endpoint['name']}...")
+                logger.info("Testing %s...", endpoint['name'])
                 result = self._fetch_from_api(endpoint)
-                results[endpoint['name']] = {
+                return {
                     'status': 'success' if result else 'failed',
                     'data': result if result else None
                 }
             except Exception as e:
-                results[endpoint['name']] = {
+                return {
                     'status': 'error',
                     'error': str(e)
                 }
         
-        return results
+        # Probes are pure network waits, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(self.API_ENDPOINTS)) as executor:
+            probes = [executor.submit(probe, endpoint) for endpoint in self.API_ENDPOINTS]
+            return {
+                endpoint['name']: future.result()
+                for endpoint, future in zip(self.API_ENDPOINTS, probes)
+            }
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session"""
+        self.session.close()
     
     def clear_cache(self) -> None:
         """Manually clear the cache"""
         with self._cache_lock:
+            self._mem_cache, self._mem_cache_key, self._mem_cache_expires = None, None, 0.0
             if self.CACHE_FILE.exists():
                 try:
                     self.CACHE_FILE.unlink()
                     logger.info("Cache cleared successfully")
                 except Exception as e:
-                    logger.error(f"Error clearing cache: {e}")
+                    logger.error("Error clearing cache: %s", e)
     
     def get_cache_age(self) -> Optional[float]:
         """Get age of cache in seconds"""
         cached_data = self._read_cache_safe()
         if cached_data and 'timestamp' in cached_data:
-            try:
-                cache_time = datetime.fromisoformat(cached_data['timestamp'])
-                return (datetime.now() - cache_time).total_seconds()
-            except (ValueError, TypeError):
-                return None
+            expiry = self._cache_expiry(cached_data)
+            if expiry:
+                return time.time() - (expiry - self.CACHE_TTL)
         return None
\ No newline at end of file
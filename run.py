@@ -17,7 +17,7 @@ def setup_directories():
     
     # Create sample data if no scans exist
     data_dir = Path("data")
-    if len(list(data_dir.glob("*.json"))) == 0:
+    if not any(data_dir.glob("*.json")) and not any(data_dir.glob("*.json.gz")):
         print("📁 No scan data found. Creating sample data...")
         try:
             from sample_data import create_sample_scans
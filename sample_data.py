@@ -1,7 +1,10 @@
 # sample_data.py
-import json
+import gzip
+import orjson
 from datetime import datetime, timedelta
 import random
+
+import numpy as np
 from pathlib import Path
 
 def create_sample_scans(count=5):
@@ -9,46 +12,63 @@ def create_sample_scans(count=5):
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
     
-    sources = ['AJIO', 'Myntra']
-    purities = ['24K', '22K', '18K']
-    brands = ['Tanishq', 'Kalyan', 'Malabar', 'PC Jeweller', 'Senco']
+    sources = np.array(['AJIO', 'Myntra'])
+    purities = np.array(['24K', '22K', '18K'])
+    brands = np.array(['Tanishq', 'Kalyan', 'Malabar', 'PC Jeweller', 'Senco'])
+    rng = np.random.default_rng()
     
     for i in range(count):
         scan_time = datetime.now() - timedelta(days=i*2, hours=random.randint(1, 12))
         timestamp = scan_time.strftime("%Y%m%d_%H%M%S")
         
-        products = []
-        for j in range(random.randint(50, 150)):
-            weight = random.choice([1, 2, 5, 8, 10, 20, 50])
-            purity = random.choice(purities)
-            source = random.choice(sources)
-            brand = random.choice(brands)
-            
-            base_price = random.randint(5500, 6500)
-            selling_price = weight * base_price * random.uniform(0.85, 1.15)
-            expected_price = weight * base_price * 1.1
-            
-            product = {
+        # Draw every column for the scan at once, then zip the rows into products
+        n = int(rng.integers(50, 151))
+        weights = rng.choice([1, 2, 5, 8, 10, 20, 50], size=n)
+        base_prices = rng.integers(5500, 6501, size=n)
+        selling_prices = weights * base_prices * rng.uniform(0.85, 1.15, size=n)
+        expected_prices = weights * base_prices * 1.1
+        columns = zip(
+            weights.tolist(),
+            rng.choice(purities, size=n).tolist(),
+            rng.choice(sources, size=n).tolist(),
+            rng.choice(brands, size=n).tolist(),
+            base_prices.tolist(),
+            np.round(selling_prices, 2).tolist(),
+            np.round(expected_prices, 2).tolist(),
+            np.round((expected_prices - selling_prices) / expected_prices * 100, 2).tolist(),
+            np.round(selling_prices / weights, 2).tolist(),
+            (rng.random(n) > 0.5).tolist(),
+            (rng.random(n) > 0.5).tolist(),
+            rng.choice([True, False], size=n).tolist(),
+            rng.choice([0, 8, 12, 15], size=n).tolist(),
+        )
+        
+        products = [
+            {
                 'source': source,
-                'title': f"{weight}g {purity} Gold {'Coin' if random.random() > 0.5 else 'Jewellery'} - {brand}",
+                'title': f"{weight}g {purity} Gold {'Coin' if coin_title else 'Jewellery'} - {brand}",
                 'description': f"Pure {purity} gold product",
                 'weight_grams': weight,
                 'purity': purity,
-                'product_type': 'coin' if random.random() > 0.5 else 'jewellery',
-                'is_jewellery': random.choice([True, False]),
-                'selling_price': round(selling_price, 2),
-                'expected_price': round(expected_price, 2),
-                'discount_percent': round((expected_price - selling_price) / expected_price * 100, 2),
-                'price_per_gram': round(selling_price / weight, 2),
+                'product_type': 'coin' if coin_type else 'jewellery',
+                'is_jewellery': is_jewellery,
+                'selling_price': selling_price,
+                'expected_price': expected_price,
+                'discount_percent': discount_percent,
+                'price_per_gram': price_per_gram,
                 'url': f"https://www.{source.lower()}.com/product/{j}",
                 'image_url': '',
                 'brand': brand,
-                'spot_price': round(base_price, 2),
-                'making_charges_percent': random.choice([0, 8, 12, 15]),
+                'spot_price': base_price,
+                'making_charges_percent': making_charges_percent,
                 'gst_percent': 3,
                 'timestamp': scan_time.isoformat()
             }
-            products.append(product)
+            for j, (
+                weight, purity, source, brand, base_price, selling_price, expected_price,
+                discount_percent, price_per_gram, coin_title, coin_type, is_jewellery, making_charges_percent,
+            ) in enumerate(columns)
+        ]
         
         scan_data = {
             'timestamp': scan_time.isoformat(),
@@ -56,9 +76,9 @@ def create_sample_scans(count=5):
             'products': products
         }
         
-        filename = data_dir / f"scan_results_{timestamp}.json"
-        with open(filename, 'w') as f:
-            json.dump(scan_data, f, indent=2)
+        filename = data_dir / f"scan_results_{timestamp}.json.gz"
+        with gzip.open(filename, 'wb', compresslevel=3) as f:
+            f.write(orjson.dumps(scan_data))  # Compact; the file is gzipped and only read by the API
         
         print(f"✅ Created sample scan: {filename}")
     
@@ -7,12 +7,14 @@ Runs the gold deal finder and sends results to Telegram
 import os
 import sys
 import json
+import orjson
 import gzip
 import shutil
 import asyncio
 from datetime import datetime
 from pathlib import Path
 import logging
+import numpy as np
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -28,51 +30,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SENT_ALERTS_LIMIT = 500
+
 class GitHubActionsScanner:
     def __init__(self):
         self.scraper = GoldScraper()
         self.bot = TelegramAlertBot()
         self.price_calc = GoldPriceCalculator()
         self.test_run = os.getenv('TEST_RUN', 'false').lower() == 'true'
+        # CI run identifiers, read once for the summary, error message and results file
+        self.run_id = os.getenv('GITHUB_RUN_ID', '')
+        self.run_number = os.getenv('GITHUB_RUN_NUMBER', '')
         
         if self.test_run:
             logger.info("🔧 Running in TEST mode — No Telegram alerts will be sent")
 
-    def _load_sent_alerts(self) -> set:
-        """Load previously sent alert URLs to avoid duplicate Telegram notifications."""
+    def _load_sent_alerts(self) -> dict:
+        """Load previously sent alert URLs, least recently seen first, to avoid duplicate Telegram notifications."""
         alert_file = Path("data/sent_alerts.json")
         if alert_file.exists():
             try:
-                return set(json.loads(alert_file.read_text()))
+                # dict keys keep the saved order, which a set would lose
+                return dict.fromkeys(json.loads(alert_file.read_text()))
             except Exception:
-                return set()
-        return set()
+                return {}
+        return {}
 
-    def _save_sent_alerts(self, urls: set) -> None:
-        """Persist sent alert URLs (keep last 500 to bound file size)."""
+    def _save_sent_alerts(self, urls: dict) -> None:
+        """Persist sent alert URLs (keep the 500 most recently seen to bound file size)."""
         alert_file = Path("data/sent_alerts.json")
-        alert_file.write_text(json.dumps(list(urls)[-500:]))
+        alert_file.write_text(json.dumps(list(urls)[-SENT_ALERTS_LIMIT:]))
         
     def filter_good_deals(self, products):
         """Filter products based on criteria"""
-        good_deals = []
-        
-        for product in products:
-            # Apply filters
-            meets_criteria = (
-                product['discount_percent'] >= MIN_DISCOUNT_PERCENTAGE and
-                product['weight_grams'] >= MIN_WEIGHT and
-                product['selling_price'] > 1000
-            )
-            
-            if meets_criteria:
-                good_deals.append(product)
+        count = len(products)
+        discounts = np.fromiter((p['discount_percent'] for p in products), dtype=np.float64, count=count)
+        weights = np.fromiter((p['weight_grams'] for p in products), dtype=np.float64, count=count)
+        prices = np.fromiter((p['selling_price'] for p in products), dtype=np.float64, count=count)
+
+        # Apply filters as one vectorized mask
+        matches = np.flatnonzero(
+            (discounts >= MIN_DISCOUNT_PERCENTAGE) & (weights >= MIN_WEIGHT) & (prices > 1000)
+        )
 
-        good_deals = sorted(
-            good_deals,
-            key=lambda p: p.get("discount_percent", float("inf"))
-        )[:4]
-        return good_deals
+        # Biggest discounts first; the stable sort keeps the original order between equal discounts
+        picks = matches[np.argsort(-discounts[matches], kind="stable")[:4]]
+        return [products[i] for i in picks]
     
     async def send_telegram_summary(self, total_products, good_deals, duration):
         """Send summary to Telegram"""
@@ -105,31 +108,34 @@ class GitHubActionsScanner:
                     summary += f"   ₹{deal['selling_price']:,.0f} ({deal['weight_grams']}g {deal['purity']})\n"
             
             summary += f"\n⏰ <i>Next scan: 10 minutes</i>"
-            summary += f"\n🔄 <i>Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}</i>"
+            summary += f"\n🔄 <i>Run ID: #{self.run_number or 'N/A'}</i>"
             
             # Send summary
-            await self.bot.bot.send_message(
-                chat_id=os.getenv('TELEGRAM_CHAT_ID'),
-                text=summary,
-                parse_mode='HTML'
-            )
+            await self.bot.send_message(summary)
             
             # Send individual alerts for good deals (if not test run)
             if good_deals and not self.test_run:
                 sent_urls = self._load_sent_alerts()
-                new_deals = [d for d in good_deals if d.get('url') not in sent_urls]
+                new_deals = []
+                for d in good_deals:
+                    url = d.get('url')
+                    if url in sent_urls:
+                        # Seen again: move it to the recent end so trimming drops the least recently seen URLs
+                        sent_urls.pop(url)
+                        sent_urls[url] = None
+                    else:
+                        new_deals.append(d)
                 if new_deals:
-                    logger.info(f"Sending {len(new_deals)} NEW deal alerts (skipped {len(good_deals) - len(new_deals)} duplicates)")
-                    await asyncio.gather(
-                        *(self.bot.send_alert(d) for d in new_deals)
-                    )
-                    sent_urls.update(d.get('url', '') for d in new_deals)
-                    self._save_sent_alerts(sent_urls)
+                    logger.info("Sending %s NEW deal alerts (skipped %s duplicates)", len(new_deals), len(good_deals) - len(new_deals))
+                    await self.bot.send_alerts(new_deals)
+                    for d in new_deals:
+                        sent_urls[d.get('url', '')] = None
                 else:
                     logger.info("All deals already sent — skipping alerts")
+                self._save_sent_alerts(sent_urls)
                     
         except Exception as e:
-            logger.error(f"Error sending Telegram summary: {e}")
+            logger.error("Error sending Telegram summary: %s", e)
     
     async def run_scan(self):
         logger.info("🚀 Starting gold deal scan...")
@@ -137,28 +143,31 @@ class GitHubActionsScanner:
 
         try:
             # Run sources concurrently
-            all_products = await asyncio.to_thread(self.scraper.scrape_all)
+            all_products = await self.scraper.scrape_all_async()
 
             good_deals = self.filter_good_deals(all_products)
 
             duration = (datetime.now() - start_time).total_seconds()
 
-            logger.info(f"📊 Scan completed in {duration:.1f}s")
-            logger.info(f"📦 Total products: {len(all_products)}")
-            logger.info(f"🔥 Good deals: {len(good_deals)}")
-
-            self.save_results(all_products, good_deals, duration)
+            logger.info("📊 Scan completed in %.1fs", duration)
+            logger.info("📦 Total products: %s", len(all_products))
+            logger.info("🔥 Good deals: %s", len(good_deals))
 
-            if not self.test_run:
-                await self.send_telegram_summary(
-                    len(all_products), good_deals, duration
+            # The results file is written in a worker thread while the Telegram summary is in flight
+            save_task = asyncio.to_thread(self.save_results, all_products, good_deals, duration)
+            if self.test_run:
+                await save_task
+            else:
+                await asyncio.gather(
+                    save_task,
+                    self.send_telegram_summary(len(all_products), good_deals, duration)
                 )
 
             return len(good_deals)
 
 
         except Exception as e:
-            logger.error(f"❌ Scan failed: {e}")
+            logger.error("❌ Scan failed: %s", e)
             import traceback
             traceback.print_exc()
             
@@ -170,15 +179,11 @@ class GitHubActionsScanner:
 
 Error: {str(e)[:200]}
 Time: {datetime.now().strftime('%H:%M:%S')}
-Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}
+Run ID: #{self.run_number or 'N/A'}
 
 <i>Check GitHub Actions logs for details.</i>
 """
-                    await self.bot.bot.send_message(
-                        chat_id=os.getenv('TELEGRAM_CHAT_ID'),
-                        text=error_msg,
-                        parse_mode='HTML'
-                    )
+                    await self.bot.send_message(error_msg)
                 except:
                     pass
             
@@ -186,6 +191,11 @@ Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}
     
     def save_results(self, all_products, good_deals, duration):
         """Save scan results to JSON file"""
+        if not all_products:
+            # An empty scan would only shadow the last useful results file
+            logger.info("💾 No products scraped — skipping results file")
+            return
+
         try:
             results = {
                 'timestamp': datetime.now().isoformat(),
@@ -194,24 +204,25 @@ Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}
                 'good_deals': len(good_deals),
                 'all_products': all_products,
                 'good_deals_details': good_deals,
-                'github_run_id': os.getenv('GITHUB_RUN_ID', ''),
-                'github_run_number': os.getenv('GITHUB_RUN_NUMBER', '')
+                'github_run_id': self.run_id,
+                'github_run_number': self.run_number
             }
             
              # Save results in background
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data/scan_results_{timestamp}.json"
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            filename = f"data/scan_results_{timestamp}.json.gz"
+            # Written compressed and compact; the API reads .json.gz scans directly
+            with gzip.open(filename, 'wb', compresslevel=3) as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY, default=str))
             
-            logger.info(f"💾 Results saved to {filename}")
+            logger.info("💾 Results saved to %s", filename)
             
         except Exception as e:
-            logger.error(f"Error saving results: {e}")
+            logger.error("Error saving results: %s", e)
 
     @staticmethod
     def rotate_old_scans(max_files=200, compress_after=50):
-        """Compress old scans to .gz and delete beyond max_files."""
+        """Compress old .json scans (written before scans were gzipped) and delete beyond max_files."""
         data_dir = Path("data")
         # Compress old JSON files
         json_files = sorted(
@@ -225,9 +236,9 @@ Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}
                     with gzip.open(f.with_suffix('.json.gz'), 'wb') as fout:
                         shutil.copyfileobj(fin, fout)
                 f.unlink()
-                logger.info(f"Compressed {f.name}")
+                logger.info("Compressed %s", f.name)
             except Exception as e:
-                logger.error(f"Error compressing {f.name}: {e}")
+                logger.error("Error compressing %s: %s", f.name, e)
 
         # Delete files beyond max
         all_files = sorted(
@@ -239,9 +250,9 @@ Run ID: #{os.getenv('GITHUB_RUN_NUMBER', 'N/A')}
         for f in all_files[max_files:]:
             try:
                 f.unlink()
-                logger.info(f"Deleted old scan {f.name}")
+                logger.info("Deleted old scan %s", f.name)
             except Exception as e:
-                logger.error(f"Error deleting {f.name}: {e}")
+                logger.error("Error deleting %s: %s", f.name, e)
 
 async def main():
     """Main entry point"""
@@ -253,4 +264,10 @@ async def main():
     sys.exit(0 if deals_found >= 0 else 1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        # libuv-backed loop; installed with uvicorn[standard] on Linux and macOS
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -1,18 +1,51 @@
+import asyncio
+import html
+from bisect import bisect_left
+from functools import lru_cache
 import telegram
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
+from telegram.request import HTTPXRequest
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 from price_calculator import GoldPriceCalculator
 from typing import List, Dict
 from datetime import datetime
 
+# Discount thresholds (strictly above) and the badge for each band
+DISCOUNT_EMOJI_STEPS = (5, 10, 15)
+DISCOUNT_EMOJIS = ("💎", "💰", "🔥", "🔥🔥")
+
+
+@lru_cache(maxsize=16)
+def format_found_at(timestamp: str) -> str:
+    """Clock time for an ISO timestamp; every product in a scan shares one, so it is parsed once"""
+    return datetime.fromisoformat(timestamp).strftime('%I:%M %p')
+
+
 class TelegramAlertBot:
     def __init__(self):
-        self.bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
+        # One Bot and one kept-alive connection pool carry the summary and every alert;
+        # sized for the concurrent alert sends plus the summary
+        self.bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN, request=HTTPXRequest(connection_pool_size=8))
         self.price_calculator = GoldPriceCalculator()
+        # Alerts are sent concurrently; cap in-flight sends well under Telegram's 30 msg/s
+        self._send_sem = asyncio.Semaphore(5)
+    
+    async def send_message(self, text: str, **kwargs):
+        """Send an HTML message to the alert chat"""
+        return await self.bot.send_message(
+            chat_id=TELEGRAM_CHAT_ID,
+            text=text,
+            parse_mode='HTML',
+            **kwargs
+        )
     
     async def send_alert(self, product: Dict):
         """Send alert for a single product"""
+        async with self._send_sem:
+            await self._send_alert(product)
+    
+    async def _send_alert(self, product: Dict):
         try:
             # Create message
             message = self._format_product_message(product)
@@ -51,25 +84,46 @@ class TelegramAlertBot:
         except Exception as e:
             print(f"Error sending Telegram alert: {e}")
     
+    async def send_alerts(self, products: List[Dict]):
+        """Send alerts for several products, as one album when they all have images"""
+        # An album takes 2-10 photos in a single request but cannot carry inline buttons,
+        # so each caption links the product instead
+        if 2 <= len(products) <= 10 and all(p.get('image_url') for p in products):
+            media = [
+                InputMediaPhoto(
+                    media=product['image_url'],
+                    caption=self._format_product_message(product)
+                    + f"\n<a href=\"{html.escape(product['url'])}\">🛒 View Product</a>",
+                    parse_mode='HTML'
+                )
+                for product in products
+            ]
+            try:
+                await self.bot.send_media_group(chat_id=TELEGRAM_CHAT_ID, media=media)
+                return
+            except Exception as e:
+                print(f"Failed to send alert album: {e}")
+                # Fall through to one alert per product
+        
+        await asyncio.gather(
+            *(self.send_alert(product) for product in products),
+            return_exceptions=True
+        )
+    
     def _format_product_message(self, product: Dict) -> str:
         """Format product information for Telegram message"""
         # Emoji based on discount
-        if product['discount_percent'] > 15:
-            discount_emoji = "🔥🔥"
-        elif product['discount_percent'] > 10:
-            discount_emoji = "🔥"
-        elif product['discount_percent'] > 5:
-            discount_emoji = "💰"
-        else:
-            discount_emoji = "💎"
+        discount_emoji = DISCOUNT_EMOJIS[bisect_left(DISCOUNT_EMOJI_STEPS, product['discount_percent'])]
         
         # Format numbers
         selling_price = f"₹{product['selling_price']:,.2f}"
         expected_price = f"₹{product['expected_price']:,.2f}"
         price_per_gram = f"₹{product['price_per_gram']:,.2f}"
         
-        # Product type emoji
-        type_emoji = "💍" if product['is_jewellery'] else "🪙"
+        # Product type emoji and label
+        is_jewellery = product['is_jewellery']
+        type_emoji = "💍" if is_jewellery else "🪙"
+        type_label = 'Jewellery' if is_jewellery else 'Coin/Bar'
         
         message = f"""
 {discount_emoji} <b>GOLD DEAL ALERT!</b> {discount_emoji}
@@ -79,7 +133,7 @@ class TelegramAlertBot:
 
 <b>⚖️ Weight:</b> {product['weight_grams']}g
 <b>🔬 Purity:</b> {product['purity']}
-<b>🏷️ Type:</b> {'Jewellery' if product['is_jewellery'] else 'Coin/Bar'}
+<b>🏷️ Type:</b> {type_label}
 
 <b>💰 Selling Price:</b> {selling_price}
 <b>📈 Expected Value:</b> {expected_price}
@@ -91,7 +145,7 @@ class TelegramAlertBot:
 <code>🎯 DISCOUNT: {product['discount_percent']:.1f}%</code>
 
 <b>🏪 Market Spot Price:</b> ₹{product['spot_price']:,.2f}/g
-<b>⏰ Found at:</b> {datetime.fromisoformat(product['timestamp']).strftime('%I:%M %p')}
+<b>⏰ Found at:</b> {format_found_at(product['timestamp'])}
 """
         return message
     
@@ -108,8 +162,7 @@ class TelegramAlertBot:
         await self.send_price_summary()
         
         # Send top 5 deals
-        for product in products[:5]:
-            await self.send_alert(product)
+        await self.send_alerts(products[:5])
         
         # If more deals, send summary
         if len(products) > 5:
@@ -1,6 +1,4 @@
 from curl_cffi import requests
-import time
-import random
 
 # Don't use proxies - use your own IP
 session = requests.Session(impersonate="chrome120")
@@ -20,20 +18,14 @@ session.headers.update({
 })
 
 try:
-    # First visit - get cookies
-    print("Step 1: Visiting homepage...")
-    home_response = session.get("https://www.myntra.com/", timeout=10)
+    # One visit for cookies; the body is never read, and the TLS fingerprint comes from impersonate
+    print("Step 1: Priming cookies from homepage...")
+    home_response = session.get("https://www.myntra.com/", timeout=10, stream=True)
     print(f"Homepage status: {home_response.status_code}")
-    time.sleep(random.uniform(3, 5))
-    
-    # Second visit - search page
-    print("Step 2: Visiting search page...")
-    search_response = session.get("https://www.myntra.com/gold-coin", timeout=10)
-    print(f"Search page status: {search_response.status_code}")
-    time.sleep(random.uniform(4, 6))
+    home_response.close()
     
     # Now make the API request
-    print("Step 3: Making API request...")
+    print("Step 2: Making API request...")
     response = session.get(
         "https://www.myntra.com/gateway/v4/search/gold%20coin",
         params={